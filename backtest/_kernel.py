@@ -0,0 +1,147 @@
+# backtest/_kernel.py
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _simulate(c, sides, sizes, stop_dist, sl_px, tp_px, init_balance):
+    """
+    Single-pass SL/TP state machine behind VectorBacktester.run.
+
+    c           : float64 array of close prices, one entry per bar.
+    sides       : int8 array of pre-computed decisions (+1 long, -1 short, 0 flat).
+    sizes       : float64 array with the fraction of equity to risk per bar.
+    stop_dist   : float64 array, stop-loss distance if entering at that bar.
+    sl_px, tp_px: float64 arrays, stop-loss / take-profit price if entering at
+                  that bar on the side given by `sides`.
+    init_balance: starting equity.
+
+    Only the path-dependent sequencing happens here; all per-bar price
+    arithmetic is done up front with NumPy.
+
+    Returns (entry_idx, exit_idx, side, entry_px, exit_px, qty, pnl, balance_after),
+    each trimmed to the number of completed trades.
+    """
+    n = c.shape[0]
+
+    # an entry bar and its exit check never share an iteration, so a trade
+    # spans at least two bars: n // 2 + 1 bounds the trade count
+    cap = n // 2 + 1
+    entry_idx = np.empty(cap, np.int64)
+    exit_idx = np.empty(cap, np.int64)
+    side = np.empty(cap, np.int8)
+    entry_px = np.empty(cap, np.float64)
+    exit_px = np.empty(cap, np.float64)
+    qty = np.empty(cap, np.float64)
+    pnl = np.empty(cap, np.float64)
+    balance_after = np.empty(cap, np.float64)
+
+    balance = init_balance
+    k = 0
+
+    # open position state; pos_side == 0 means no position
+    pos_side = 0
+    pos_idx = 0
+    pos_px = 0.0
+    pos_qty = 0.0
+    pos_sl = 0.0
+    pos_tp = 0.0
+
+    for i in range(n - 1):
+        # === Position management ===
+        if pos_side != 0:
+            price_next = c[i + 1]
+            # side as a +/-1 multiplier folds the long and short checks into
+            # straight-line math; stop-loss wins when both levels are hit
+            hit_sl = pos_side * (price_next - pos_sl) <= 0.0
+            hit_tp = pos_side * (price_next - pos_tp) >= 0.0
+
+            if hit_sl | hit_tp:
+                exit_price = pos_sl if hit_sl else pos_tp
+                trade_pnl = (exit_price - pos_px) * pos_qty * pos_side
+                balance += trade_pnl
+                entry_idx[k] = pos_idx
+                exit_idx[k] = i + 1
+                side[k] = pos_side
+                entry_px[k] = pos_px
+                exit_px[k] = exit_price
+                qty[k] = pos_qty
+                pnl[k] = trade_pnl
+                balance_after[k] = balance
+                k += 1
+                pos_side = 0
+            # if no exit, continue to next bar
+            continue
+
+        # === New entry decision ===
+        s = sides[i]
+        if s == 0:
+            continue
+        if not stop_dist[i] > 0.0:
+            # zero/NaN ATR gives no usable stop distance
+            continue
+
+        pos_side = s
+        pos_idx = i
+        pos_px = c[i]
+        pos_qty = balance * sizes[i] / stop_dist[i]
+        pos_sl = sl_px[i]
+        pos_tp = tp_px[i]
+
+    # Close any open position at the final bar
+    if pos_side != 0:
+        exit_price = c[n - 1]
+        trade_pnl = (exit_price - pos_px) * pos_qty * pos_side
+        balance += trade_pnl
+        entry_idx[k] = pos_idx
+        exit_idx[k] = n - 1
+        side[k] = pos_side
+        entry_px[k] = pos_px
+        exit_px[k] = exit_price
+        qty[k] = pos_qty
+        pnl[k] = trade_pnl
+        balance_after[k] = balance
+        k += 1
+
+    return (
+        entry_idx[:k], exit_idx[:k], side[:k], entry_px[:k],
+        exit_px[:k], qty[:k], pnl[:k], balance_after[:k],
+    )
+
+
+@njit(cache=True)
+def _summary_kernel(bal, pnl, init_balance):
+    """
+    One pass over a trade log for backtest.metrics.summary.
+
+    bal         : float64 array of balance_after per trade.
+    pnl         : float64 array of pnl per trade.
+    init_balance: equity before the first trade.
+
+    Returns (n_trades, wins, mean_ret, m2_ret, max_drawdown), where m2_ret is
+    the sum of squared deviations from mean_ret (Welford), so constant returns
+    give an exact zero variance.
+    """
+    n = bal.shape[0]
+    wins = 0
+    mean = 0.0
+    m2 = 0.0
+    prev = init_balance
+    peak = init_balance
+    mdd = 0.0
+    for i in range(n):
+        b = bal[i]
+        ret = (b - prev) / prev
+        delta = ret - mean
+        mean += delta / (i + 1)
+        m2 += delta * (ret - mean)
+        if b > peak:
+            peak = b
+        dd = (b - peak) / peak
+        if dd < mdd:
+            mdd = dd
+        if pnl[i] > 0:
+            wins += 1
+        prev = b
+    return n, wins, mean, m2, mdd
@@ -1,8 +1,17 @@
 # backtest/backtester.py
 
+import hashlib
+import os
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 
+from ._kernel import _simulate
+
+# trade direction per policy label code {0: flat, 1: long, 2: short}
+_DIRECTION = np.array([0, 1, -1], dtype=np.int8)
+
 class VectorBacktester:
     """
     A simple vectorized backtester for intra-day/swing strategies.
@@ -27,18 +36,21 @@ class VectorBacktester:
               - 'o','h','l','c','v','atr', plus any technical features
               - one column per HMM state probability (e.g. 'state_0', 'state_1', ...)
         feature_cols : list of str
-            Names of the feature columns passed to policy.decide (excluding state_cols).
+            Names of the feature columns passed to the policy (excluding state_cols).
         state_cols : list of str
             Names of the HMM state-probability columns.
-        policy : object with decide(feat_row, prob_state) -> dict(side, size)
+        policy : object with decide_batch(feat_mat, prob_mat) -> (sides, sizes)
+            sides in the label coding 0 flat, 1 long, 2 short (see PolicyModel).
         sl_atr : float
             Multiplier for ATR to compute stop-loss distance.
         tp_atr : float
             Multiplier for ATR to compute take-profit distance.
         initial_balance : float
             Starting equity (e.g. 1.0 for 100%).
+
+        The backtester does not copy `df`: close, ATR and the index are kept
+        as views, so `df` must not be mutated while the backtester is in use.
         """
-        self.df = df.copy().reset_index(drop=True)
         self.feature_cols = feature_cols
         self.state_cols = state_cols
         self.policy = policy
@@ -46,6 +58,14 @@ class VectorBacktester:
         self.tp_atr = tp_atr
         self.initial_balance = initial_balance
 
+        # column arrays extracted once; run() never touches the DataFrame
+        # (DataFrame blocks are column-major; make the row-wise model inputs C-contiguous)
+        self._feat = np.ascontiguousarray(df[feature_cols].to_numpy(dtype=np.float64))
+        self._prob = np.ascontiguousarray(df[state_cols].to_numpy(dtype=np.float64))
+        self._c = df['c'].to_numpy(dtype=np.float64, copy=False)
+        self._atr = df['atr'].to_numpy(dtype=np.float64, copy=False)
+        self._ts = df.index.to_numpy(copy=False)
+
     def run(self) -> tuple[pd.DataFrame, float]:
         """
         Execute the backtest.
@@ -58,105 +78,80 @@ class VectorBacktester:
         final_balance : float
             Equity after all trades.
         """
-        balance = self.initial_balance
-        position = None  # dict with keys: side, entry_price, qty, sl, tp, entry_idx
-        trade_log = []
-
-        for i in range(len(self.df) - 1):
-            row = self.df.iloc[i]
-            next_row = self.df.iloc[i + 1]
-            price_next = next_row['c']
-
-            # === Position management ===
-            if position is not None:
-                # check stop-loss or take-profit
-                exit_price = None
-                if position['side'] == 'long':
-                    if price_next <= position['sl']:
-                        exit_price = position['sl']
-                    elif price_next >= position['tp']:
-                        exit_price = position['tp']
-                else:  # short
-                    if price_next >= position['sl']:
-                        exit_price = position['sl']
-                    elif price_next <= position['tp']:
-                        exit_price = position['tp']
-
-                if exit_price is not None:
-                    # close position
-                    pnl = (exit_price - position['entry_price']) * position['qty'] * (1 if position['side']=='long' else -1)
-                    balance += pnl
-                    trade_log.append({
-                        'entry_time':     self.df.loc[position['entry_idx'], :].name,
-                        'exit_time':      next_row.name,
-                        'side':           position['side'],
-                        'entry_price':    position['entry_price'],
-                        'exit_price':     exit_price,
-                        'qty':            position['qty'],
-                        'pnl':            pnl,
-                        'balance_after':  balance
-                    })
-                    position = None
-                # if no exit, continue to next bar
-                continue
-
-            # === New entry decision ===
-            feat = row[self.feature_cols].values.reshape(1, -1)
-            prob = row[self.state_cols].values
-            decision = self.policy.decide(feat, prob)
-
-            if decision['side'] != 'flat':
-                size_frac = decision['size']
-                atr = row['atr']
-                stop_dist = self.sl_atr * atr
-                take_dist = self.tp_atr * atr
-
-                # calculate stop & take prices
-                if decision['side'] == 'long':
-                    sl = row['c'] - stop_dist
-                    tp = row['c'] + take_dist
-                else:
-                    sl = row['c'] + stop_dist
-                    tp = row['c'] - take_dist
-
-                # compute quantity in base asset
-                risk_amount = balance * size_frac
-                qty = risk_amount / stop_dist
-
-        position = {
-                    'side':        decision['side'],
-                    'entry_price': row['c'],
-                    'qty':         qty,
-                    'sl':          sl,
-                    'tp':          tp,
-                    'entry_idx':   i
-                }
-
-        # Close any open position at the final bar
-        if position is not None:
-            last_row = self.df.iloc[-1]
-            exit_price = last_row['c']
-            pnl = (
-                (exit_price - position['entry_price'])
-                * position['qty']
-                * (1 if position['side'] == 'long' else -1)
-            )
-            balance += pnl
-            trade_log.append({
-                'entry_time':  self.df.loc[position['entry_idx'], :].name,
-                'exit_time':   last_row.name,
-                'side':        position['side'],
-                'entry_price': position['entry_price'],
-                'exit_price':  exit_price,
-                'qty':         position['qty'],
-                'pnl':         pnl,
-                'balance_after': balance,
-            })
-
-        trades_df = pd.DataFrame(trade_log)
+        # one batched policy call instead of one decide() per bar
+        codes, sizes = self.policy.decide_batch(self._feat, self._prob)
+
+        # label codes -> trade direction (+1 long, -1 short, 0 flat)
+        sides = _DIRECTION[np.asarray(codes, dtype=np.intp)]
+        sizes = np.ascontiguousarray(sizes, dtype=np.float64)
+
+        # SL/TP levels are a pure function of c and atr: compute them for all
+        # bars at once, leaving only the sequencing to the kernel
+        c = self._c
+        stop_dist = self.sl_atr * self._atr
+        take_dist = self.tp_atr * self._atr
+        sl_px = c - sides * stop_dist
+        tp_px = c + sides * take_dist
+
+        (entry_idx, exit_idx, side, entry_px, exit_px,
+         qty, pnl, balance_after) = _simulate(
+            c, sides, sizes, stop_dist, sl_px, tp_px, self.initial_balance
+        )
+
+        ts = self._ts
+        trades_df = pd.DataFrame({
+            'entry_time':    ts[entry_idx],
+            'exit_time':     ts[exit_idx],
+            'side':          np.where(side == 1, 'long', 'short'),
+            'entry_price':   entry_px,
+            'exit_price':    exit_px,
+            'qty':           qty,
+            'pnl':           pnl,
+            'balance_after': balance_after,
+        })
+        balance = float(balance_after[-1]) if len(balance_after) else self.initial_balance
         return trades_df, balance
-    
-def run_backtest(symbol: str, hist: str = "60 days ago UTC") -> None:
+
+def _cached_policy(cache_dir: Path, symbol: str, X: np.ndarray, y: np.ndarray, params: dict):
+    """
+    PolicyModel trained on (X, y) with params, loaded from cache_dir if the
+    same data was trained on last time.
+
+    There is one model file per symbol and params, replaced whenever the data
+    changes; the sidecar ``.key`` file holds the hash of the data it was
+    trained on.
+    """
+    from models.policy import PolicyModel
+
+    params_key = hashlib.sha1(repr(sorted(params.items())).encode()).hexdigest()[:16]
+    data_key = hashlib.sha1()
+    for arr in (X, y):
+        arr = np.ascontiguousarray(arr)
+        data_key.update(f"{arr.dtype}{arr.shape}".encode())
+        data_key.update(arr.data)
+    data_key = data_key.hexdigest()
+    path = cache_dir / f"policy_{symbol}_{params_key}.txt"
+    key_path = path.with_suffix(".key")
+
+    try:
+        if key_path.read_text() == data_key:
+            return PolicyModel.load(path, params, cache_dir=cache_dir)
+    except OSError:
+        pass  # nothing cached yet
+    policy = PolicyModel(params, cache_dir=cache_dir)
+    policy.train(X, y)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # model first, key last: a run interrupted in between leaves a key that
+    # does not match, so the next run trains again
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    policy.save(tmp)
+    os.replace(tmp, path)
+    tmp = key_path.with_name(key_path.name + f".{os.getpid()}.tmp")
+    tmp.write_text(data_key)
+    os.replace(tmp, key_path)
+    return policy
+
+def run_backtest(symbol: str, hist: str = "60 days ago UTC", model_cache: str = None) -> None:
     """Convenience helper to quickly backtest a single symbol.
 
     Parameters
@@ -165,6 +160,10 @@ def run_backtest(symbol: str, hist: str = "60 days ago UTC") -> None:
         Trading pair, e.g. ``"BTCUSDT"``.
     hist : str, optional
         How far back to fetch historical klines (default ``"60 days ago UTC"``).
+    model_cache : str, optional
+        Directory for trained models. One model is kept per symbol and
+        parameters, together with a hash of the candles it was trained on;
+        a run on the same closed candles loads it instead of training again.
     """
     from cqio.binance_client import fetch_klines
     from features.feature_union import FeatureUnion
@@ -175,6 +174,10 @@ def run_backtest(symbol: str, hist: str = "60 days ago UTC") -> None:
     # 1. fetch candles
     df = fetch_klines(symbol, INTERVAL, start_str=hist)
     df = df.rename(columns={c: c.lower() for c in df.columns})
+    # the last kline is still open and changes on every call; train on
+    # closed bars only so the data (and the model cache key) is stable
+    if len(df) > 1 and df.index[-1] + (df.index[-1] - df.index[-2]) > pd.Timestamp.now("UTC").tz_localize(None):
+        df = df.iloc[:-1]
 
     # 2. compute features & labels
     fu = FeatureUnion(n_states=3)
@@ -192,8 +195,11 @@ def run_backtest(symbol: str, hist: str = "60 days ago UTC") -> None:
     # 3. train model on the same history (demo purpose)
     X = feats[feat_cols + state_cols].values
     y = feats["label"].values
-    policy = PolicyModel(LIGHTGBM_PARAMS)
-    policy.train(X, y)
+    if model_cache is None:
+        policy = PolicyModel(LIGHTGBM_PARAMS)
+        policy.train(X, y)
+    else:
+        policy = _cached_policy(Path(model_cache), symbol, X, y, LIGHTGBM_PARAMS)
 
     # 4. run backtest
     bt = VectorBacktester(feats, feat_cols, state_cols, policy)
@@ -3,16 +3,60 @@
 import pandas as pd
 import numpy as np
 
+from ._kernel import _summary_kernel
+
+try:  # optional: fuses the equity-curve arithmetic without temporaries
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+# below this length numexpr's dispatch overhead outweighs the fused pass
+_NE_MIN_SIZE = 100_000
+
+# ---------------------------------------------------------------------------
+# ndarray kernels shared by the public helpers and summary()
+# ---------------------------------------------------------------------------
+def _returns(bal: np.ndarray, initial_balance: float) -> np.ndarray:
+    """Per-trade returns from a balance_after array."""
+    before = np.empty_like(bal)
+    before[:1] = initial_balance
+    before[1:] = bal[:-1]
+    if ne is not None and len(bal) >= _NE_MIN_SIZE:
+        return ne.evaluate("(bal - before) / before",
+                           local_dict={'bal': bal, 'before': before})
+    return (bal - before) / before
+
+def _sharpe(returns: np.ndarray, annualize: bool) -> float:
+    """Sharpe ratio of a return array (sample std, as pandas)."""
+    if len(returns) < 2:
+        return np.nan
+    std = returns.std(ddof=1)
+    if std == 0:
+        return np.nan
+    sr = returns.mean() / std
+    if annualize:
+        sr *= np.sqrt(len(returns))
+    return sr
+
+def _max_drawdown(bal: np.ndarray, initial_balance: float) -> float:
+    """Maximum drawdown of the equity curve seeded with initial_balance."""
+    balances = np.empty(len(bal) + 1)
+    balances[0] = initial_balance
+    balances[1:] = bal
+    peak = np.maximum.accumulate(balances)
+    if ne is not None and len(balances) >= _NE_MIN_SIZE:
+        return ne.evaluate("(balances - peak) / peak",
+                           local_dict={'balances': balances, 'peak': peak}).min()
+    return ((balances - peak) / peak).min()
+
 def compute_trade_returns(trades: pd.DataFrame, initial_balance: float = 1.0) -> pd.Series:
     """
     Compute per-trade return series as (balance_after - balance_before) / balance_before.
     Assumes `trades` has a 'balance_after' column and that the first trade's
     balance_before is `initial_balance`.
     """
-    # balance_before for each trade
-    balance_before = np.concatenate([[initial_balance], trades['balance_after'].iloc[:-1].values])
-    returns = (trades['balance_after'].values - balance_before) / balance_before
-    return pd.Series(returns, index=trades.index)
+    bal = trades['balance_after'].to_numpy(dtype=np.float64)
+    return pd.Series(_returns(bal, initial_balance), index=trades.index)
 
 def sharpe_ratio(returns: pd.Series, annualize: bool = True) -> float:
     """
@@ -20,22 +64,14 @@ def sharpe_ratio(returns: pd.Series, annualize: bool = True) -> float:
     - returns: pd.Series of per-trade returns (decimal, e.g. 0.02 for +2%)
     - annualize: if True, multiply by sqrt(N) to annualize based on trade frequency
     """
-    if returns.std() == 0 or len(returns) < 2:
-        return np.nan
-    sr = returns.mean() / returns.std()
-    if annualize:
-        sr *= np.sqrt(len(returns))
-    return sr
+    return _sharpe(np.asarray(returns, dtype=np.float64), annualize)
 
 def max_drawdown(trades: pd.DataFrame, initial_balance: float = 1.0) -> float:
     """
     Compute the maximum drawdown of the equity curve.
     - trades: DataFrame with 'balance_after'
     """
-    balances = np.concatenate([[initial_balance], trades['balance_after'].values])
-    peak = np.maximum.accumulate(balances)
-    drawdowns = (balances - peak) / peak
-    return drawdowns.min()
+    return _max_drawdown(trades['balance_after'].to_numpy(dtype=np.float64), initial_balance)
 
 def win_rate(trades: pd.DataFrame) -> float:
     """
@@ -43,14 +79,15 @@ def win_rate(trades: pd.DataFrame) -> float:
     """
     if len(trades) == 0:
         return np.nan
-    return (trades['pnl'] > 0).mean()
+    return (trades['pnl'].to_numpy() > 0).mean()
 
 def expectancy(trades: pd.DataFrame, initial_balance: float = 1.0) -> float:
     """
     Average return per trade (decimal).
     """
-    returns = compute_trade_returns(trades, initial_balance)
-    return returns.mean() if len(returns) > 0 else np.nan
+    if len(trades) == 0:
+        return np.nan
+    return compute_trade_returns(trades, initial_balance).mean()
 
 def summary(trades: pd.DataFrame, initial_balance: float = 1.0) -> dict:
     """
@@ -61,11 +98,20 @@ def summary(trades: pd.DataFrame, initial_balance: float = 1.0) -> dict:
       - sharpe_ratio
       - max_drawdown
     """
-    returns = compute_trade_returns(trades, initial_balance)
+    # pull both columns out once and derive every metric in a single pass
+    bal = trades['balance_after'].to_numpy(dtype=np.float64)
+    pnl = trades['pnl'].to_numpy(dtype=np.float64)
+    n, wins, mean_ret, m2_ret, mdd = _summary_kernel(bal, pnl, float(initial_balance))
+
+    sharpe = np.nan
+    if n >= 2:
+        std = np.sqrt(m2_ret / (n - 1))
+        if std != 0:
+            sharpe = mean_ret / std * np.sqrt(n)
     return {
-        'total_trades': len(trades),
-        'win_rate':            win_rate(trades),
-        'expectancy':          expectancy(trades, initial_balance),
-        'sharpe_ratio':        sharpe_ratio(returns, annualize=True),
-        'max_drawdown':        max_drawdown(trades, initial_balance)
+        'total_trades': n,
+        'win_rate':            wins / n if n else np.nan,
+        'expectancy':          mean_ret if n else np.nan,
+        'sharpe_ratio':        sharpe,
+        'max_drawdown':        mdd
     }
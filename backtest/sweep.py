@@ -0,0 +1,84 @@
+# backtest/sweep.py
+
+from typing import Optional
+
+import numpy as np
+
+def bracket_exits(
+    c: np.ndarray,
+    atr: np.ndarray,
+    entry_idx: np.ndarray,
+    directions: np.ndarray,
+    sl_grid: np.ndarray,
+    tp_grid: np.ndarray,
+    horizon: Optional[int] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    First exit bar of every entry for a whole grid of (sl_atr, tp_atr) brackets.
+
+    Instead of re-running the bar loop once per bracket, each entry's price
+    path is scanned once into running adverse/favourable excursions. Both are
+    monotonic, so the first breach of any bracket width is a binary search
+    (np.searchsorted), and all K brackets are resolved in O(K log N) per entry.
+
+    Parameters:
+    -----------
+    c : ndarray
+        Close prices, one per bar.
+    atr : ndarray
+        ATR per bar; bracket distances are multiples of atr at the entry bar.
+    entry_idx : ndarray of int
+        Entry bar indices.
+    directions : ndarray
+        +1 for long, -1 for short, one per entry.
+    sl_grid, tp_grid : ndarray
+        Paired stop-loss / take-profit ATR multipliers, both of length K.
+    horizon : int, optional
+        Maximum number of bars scanned after each entry (default: to the end).
+
+    Matches VectorBacktester, which checks an entry at bar i against closes
+    from bar i + 2 onwards and lets the stop-loss win if both levels are
+    crossed on the same bar.
+
+    Returns:
+    --------
+    exit_idx : ndarray of int64, shape (n_entries, K)
+        Bar at which the bracket is hit, or -1 if neither level is reached
+        (the backtester would then close at the final bar).
+    hit_sl : ndarray of bool, shape (n_entries, K)
+        True where the exit is the stop-loss.
+    """
+    c = np.asarray(c, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+    entry_idx = np.asarray(entry_idx, dtype=np.int64)
+    directions = np.asarray(directions, dtype=np.float64)
+    sl_grid = np.asarray(sl_grid, dtype=np.float64)
+    tp_grid = np.asarray(tp_grid, dtype=np.float64)
+    if sl_grid.shape != tp_grid.shape:
+        raise ValueError("sl_grid and tp_grid must have the same length")
+
+    n = len(c)
+    exit_idx = np.full((len(entry_idx), len(sl_grid)), -1, dtype=np.int64)
+    hit_sl = np.zeros((len(entry_idx), len(sl_grid)), dtype=bool)
+
+    for e, (i, d) in enumerate(zip(entry_idx, directions)):
+        start = i + 2
+        stop = n if horizon is None else min(n, start + horizon)
+        if start >= stop:
+            continue
+
+        # signed move from entry; both excursions are non-decreasing
+        move = d * (c[start:stop] - c[i])
+        adverse = np.maximum.accumulate(-move)
+        favourable = np.maximum.accumulate(move)
+
+        # first bar where the excursion reaches each bracket distance
+        j_sl = np.searchsorted(adverse, sl_grid * atr[i], side='left')
+        j_tp = np.searchsorted(favourable, tp_grid * atr[i], side='left')
+
+        j = np.minimum(j_sl, j_tp)
+        hit = j < len(move)
+        exit_idx[e, hit] = start + j[hit]
+        hit_sl[e] = hit & (j_sl <= j_tp)
+
+    return exit_idx, hit_sl
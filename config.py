@@ -26,9 +26,15 @@ LIGHTGBM_PARAMS = {
     "colsample_bytree": float(os.getenv("LGBM_COLSAMPLE", "0.8")),
 }
 
+# LightGBM training device: "auto" (GPU if this LightGBM build can use one), "gpu" or "cpu"
+LGBM_DEVICE = os.getenv("LGBM_DEVICE", "auto")
+
 # Base path for persistent storage
 DATA_PATH = os.getenv("DATA_PATH", "data")
 
+# OHLCV storage backend: "sqlite" or "parquet" (partitioned by symbol/year)
+OHLCV_BACKEND = os.getenv("OHLCV_BACKEND", "sqlite")
+
 # Risk thresholds for adaptive position sizing
 # list of tuples: (equity_upper_bound, risk_fraction)
 RISK_THRESHOLDS = [
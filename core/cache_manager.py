@@ -1,13 +1,13 @@
 import os
 import time
 import atexit
+import hashlib
 import tempfile
-import sqlite3
 from typing import Optional
 
 import pandas as pd
 import pyarrow as pa
-import pyarrow.parquet as pq
+import pyarrow.feather as feather
 
 __all__ = ["TempCache"]
 
@@ -37,10 +37,10 @@ class TempCache:
         # ────────────────────────────────────────────────────────────────
         self.dir = tempfile.TemporaryDirectory()  # e.g. /tmp/tmpabcd1234
 
-        # Single SQLite database for key–blob storage
-        self._db_path = os.path.join(self.dir.name, "tmp.db")
-        self._db = sqlite3.connect(self._db_path, check_same_thread=False)
-        self._init_db()
+        # One plain file per blob, named by sha1(key); the file's mtime is
+        # the entry timestamp, exactly like the Arrow DataFrame files.
+        self._blob_dir = os.path.join(self.dir.name, "blobs")
+        os.makedirs(self._blob_dir, exist_ok=True)
 
         # Register clean‑up handler so we *never* leave junk on disk
         atexit.register(self._cleanup)
@@ -49,16 +49,42 @@ class TempCache:
     # Public helpers for OHLCV DataFrame caching
     # ------------------------------------------------------------------
     def put_df(self, symbol: str, df: pd.DataFrame) -> None:
-        """Persist *df* to Parquet.  An existing file for *symbol* will be
-        silently overwritten.
+        """Persist *df* as an uncompressed Arrow IPC (Feather v2) file.  An
+        existing file for *symbol* will be silently overwritten.
         """
         file_path = self._df_path(symbol)
         table = pa.Table.from_pandas(df)
-        pq.write_table(table, file_path)
+        # get_df() memory-maps the file, so it must never be truncated under
+        # a live frame: write a sibling temp file and rename it over the old
+        # one, which stays mapped until its last reader is gone
+        fd, tmp_path = tempfile.mkstemp(dir=self.dir.name, suffix=".tmp")
+        os.close(fd)
+        try:
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
 
     def get_df(self, symbol: str) -> Optional[pd.DataFrame]:
         """Return the cached DataFrame for *symbol* or :pydata:`None` when the
         file does not exist **or** is older than the TTL.
+
+        The frame's columns are zero-copy views of the memory-mapped cache
+        file and therefore **read-only**; call ``.copy()`` before modifying
+        it in place.
+        """
+        table = self.get_table(symbol)
+        if table is None:
+            return None
+        return table.to_pandas(self_destruct=True, split_blocks=True)
+
+    def get_table(self, symbol: str) -> Optional[pa.Table]:
+        """Like :py:meth:`get_df` but return the raw :class:`pyarrow.Table`,
+        skipping the pandas conversion for Arrow-native callers.
         """
         file_path = self._df_path(symbol)
         if not os.path.exists(file_path):
@@ -71,89 +97,90 @@ class TempCache:
             finally:
                 return None
 
-        table = pq.read_table(file_path)
-        return table.to_pandas()
+        # uncompressed IPC maps straight into memory, no decode step
+        return feather.read_table(file_path, memory_map=True, use_threads=True)
 
     # ------------------------------------------------------------------
     # Public helpers for arbitrary binary blobs (e.g. HMM model params)
     # ------------------------------------------------------------------
     def save_blob(self, key: str, blob: bytes) -> None:
         """Store *blob* under *key*.  Overwrites any existing entry."""
-        with self._db:
-            self._db.execute(
-                "REPLACE INTO blobs(key, value, ts) VALUES (?, ?, strftime('%s','now'))",
-                (key, blob),
-            )
+        path = self._blob_path(key)
+        # write to a sibling temp file and rename, so readers never see a
+        # half-written blob
+        fd, tmp_path = tempfile.mkstemp(dir=self._blob_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def save_blobs(self, items: list[tuple[str, bytes]]) -> None:
+        """Store many ``(key, blob)`` pairs."""
+        for key, blob in items:
+            self.save_blob(key, blob)
 
     def load_blob(self, key: str) -> Optional[bytes]:
         """Retrieve blob by *key* or :pydata:`None` if missing or expired."""
-        row = self._db.execute(
-            "SELECT value, ts FROM blobs WHERE key = ?", (key,)
-        ).fetchone()
-        if row is None:
+        path = self._blob_path(key)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
             return None
 
-        value, ts = row
-        if time.time() - ts > self.ttl:
+        if time.time() - mtime > self.ttl:
             # Expired – remove and signal miss
-            with self._db:
-                self._db.execute("DELETE FROM blobs WHERE key = ?", (key,))
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
             return None
-        return value
 
     # ------------------------------------------------------------------
     # Maintenance & housekeeping
     # ------------------------------------------------------------------
     def vacuum(self) -> None:
-        """Manually purge stale Parquet files *and* expired blobs."""
+        """Manually purge stale Arrow files *and* expired blobs."""
         now = time.time()
-        # Files
-        for name in os.listdir(self.dir.name):
-            if not name.endswith(".parquet"):
-                continue
-            path = os.path.join(self.dir.name, name)
-            if now - os.path.getmtime(path) > self.ttl:
+        for folder, suffix in ((self.dir.name, ".arrow"), (self._blob_dir, ".blob")):
+            for name in os.listdir(folder):
+                if not name.endswith(suffix):
+                    continue
+                path = os.path.join(folder, name)
                 try:
-                    os.remove(path)
+                    if now - os.path.getmtime(path) > self.ttl:
+                        os.remove(path)
                 except OSError:
                     pass
 
-        # Blobs & SQLite vacuum
-        with self._db:
-            self._db.execute(
-                "DELETE FROM blobs WHERE strftime('%s','now') - ts > ?",
-                (self.ttl,),
-            )
-            self._db.execute("VACUUM")
-
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _init_db(self) -> None:
-        """Create table schema if it doesn't exist."""
-        with self._db:
-            self._db.execute(
-                """
-                CREATE TABLE IF NOT EXISTS blobs (
-                    key   TEXT PRIMARY KEY,
-                    value BLOB NOT NULL,
-                    ts    INTEGER NOT NULL       -- POSIX seconds
-                )
-                """
-            )
+    def _blob_path(self, key: str) -> str:
+        """Return the file path for blob *key* (sha1 keeps any key filename-safe)."""
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self._blob_dir, f"{digest}.blob")
 
     def _df_path(self, symbol: str) -> str:
-        """Return safe Parquet filename for *symbol* inside temp dir."""
+        """Return safe Arrow IPC filename for *symbol* inside temp dir."""
         safe = symbol.replace("/", "_").upper()
-        return os.path.join(self.dir.name, f"{safe}.parquet")
+        return os.path.join(self.dir.name, f"{safe}.arrow")
 
     # ------------------------------------------------------------------
     # Destructor / finaliser
     # ------------------------------------------------------------------
     def _cleanup(self) -> None:
-        """Close the database and delete temporary directory (and contents)."""
-        try:
-            self._db.close()
-        finally:
-            # Remove the entire tmp directory recursively
-            self.dir.cleanup()
+        """Delete temporary directory (and contents)."""
+        # Remove the entire tmp directory recursively
+        self.dir.cleanup()
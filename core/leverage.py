@@ -2,7 +2,9 @@ import math
 from dataclasses import dataclass
 from typing import Optional
 
-__all__ = ["LeverageRule", "choose_leverage"]
+import numpy as np
+
+__all__ = ["LeverageRule", "choose_leverage", "choose_leverage_batch"]
 
 @dataclass
 class LeverageRule:
@@ -19,6 +21,10 @@ TIERS = [
     LeverageRule('isolated',    2000,  float('inf'),  10),
 ]
 
+# Tier lookup arrays for the vectorized path, derived from TIERS
+_TIER_CAPS = np.array([t.max_cap for t in TIERS], dtype=np.float64)
+_TIER_MAXLEV = np.array([t.max_leverage for t in TIERS], dtype=np.float64)
+
 def choose_leverage(
     balance: float,
     risk_frac: float,
@@ -39,24 +45,81 @@ def choose_leverage(
     Returns:
     - leverage (int)
     - position size in USD (float)
+
+    Raises ValueError for inputs choose_leverage_batch() rejects.
     """
+    max_leverage = None
+    if exchange_bracket and 'maxLeverage' in exchange_bracket:
+        max_leverage = exchange_bracket['maxLeverage']
+
+    lev, qty_usd = choose_leverage_batch(
+        balance, risk_frac, stop_usd,
+        min_notional=min_notional,
+        max_leverage=max_leverage
+    )
+    return int(lev[0]), float(qty_usd[0])
+
+def choose_leverage_batch(
+    balances: np.ndarray,
+    risk_fracs: np.ndarray,
+    stop_usds: np.ndarray,
+    min_notional: float = 5.0,
+    max_leverage: Optional[np.ndarray] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized choose_leverage() for many symbols at once.
+
+    Parameters (array-like, broadcast against each other):
+    - balances: account equity in USD
+    - risk_fracs: fraction of equity to risk
+    - stop_usds: stop-loss distances in USD
+    - min_notional: minimum trade notional required by exchange
+    - max_leverage: optional exchange 'maxLeverage' cap(s)
+
+    Returns:
+    - leverage (int32 array)
+    - position size in USD (float array)
+
+    Raises ValueError if any balance is negative or non-finite, or any
+    required leverage is non-finite (e.g. a NaN risk fraction or stop).
+    """
+    balances = np.atleast_1d(np.asarray(balances, dtype=np.float64))
+    risk_fracs = np.asarray(risk_fracs, dtype=np.float64)
+    stop_usds = np.asarray(stop_usds, dtype=np.float64)
+
     # target risk in USD
-    target_risk = balance * risk_frac
+    target_risk = balances * risk_fracs
 
     # compute required leverage so that qty_usd >= min_notional
-    lev_needed = (min_notional * stop_usd) / max(1e-9, target_risk)
+    lev_needed = (min_notional * stop_usds) / np.maximum(target_risk, 1e-9)
 
-    # select appropriate tier based on balance
-    tier = next(t for t in TIERS if t.min_cap <= balance < t.max_cap)
+    # rows choose_leverage() could not size: no tier for the balance, or a
+    # non-finite leverage (NaN would otherwise cast to int32 as -2**31)
+    bad = ~(np.isfinite(balances) & (balances >= 0)) | ~np.isfinite(lev_needed)
+    if bad.any():
+        raise ValueError(
+            f"cannot choose leverage for rows {np.flatnonzero(bad).tolist()}: "
+            "balance must be finite and >= 0, risk and stop finite"
+        )
 
-    # clamp leverage between 1 and tier.max_leverage
-    lev = max(1, min(round(lev_needed), tier.max_leverage))
+    # select appropriate tier based on balance (min_cap <= balance < max_cap)
+    tier_idx = np.minimum(
+        np.searchsorted(_TIER_CAPS, balances, side='right'), len(TIERS) - 1
+    )
+
+    # clamp leverage between 1 and tier max_leverage
+    lev = np.clip(np.rint(lev_needed), 1, _TIER_MAXLEV[tier_idx])
 
     # further clamp by exchange bracket if given
-    if exchange_bracket and 'maxLeverage' in exchange_bracket:
-        lev = min(lev, exchange_bracket['maxLeverage'])
+    if max_leverage is not None:
+        lev = np.minimum(lev, max_leverage)
 
     # compute position size in USD
-    qty_usd = (target_risk * lev) / stop_usd if stop_usd > 0 else 0
+    notional = target_risk * lev
+    qty_usd = np.divide(
+        notional, stop_usds,
+        out=np.zeros_like(notional),
+        where=stop_usds > 0
+    )
 
-    return lev, qty_usd
+    return lev.astype(np.int32), qty_usd
@@ -1,14 +1,18 @@
 # core/pair_selector.py
 
 from collections import defaultdict
-import math, random
-from cqio.binance_client import client  # kita bisa pakai ccxt/python-binance
+import heapq, math, random, time
+import numpy as np
 
 class DynamicUCBSelector:
-    def __init__(self, k: int, static_pairs: list[str], universe_size: int):
+    def __init__(self, k: int, static_pairs: list[str], universe_size: int,
+                 universe_ttl: float = 300.0, client=None):
         self.k = k
         self.static = static_pairs
         self.universe_size = universe_size
+        self.universe_ttl = universe_ttl  # detik; universe di-cache selama ini
+        self._universe_cache = (0.0, [])  # (fetch_time, symbols)
+        self._client = client  # None -> cqio.binance_client.client saat dibutuhkan
         self.N_total = 0
         self.stats = defaultdict(lambda: {'N':0, 'reward':0.0})
 
@@ -20,31 +24,53 @@ class DynamicUCBSelector:
     def _fetch_top_universe(self) -> list[str]:
         """
         Ambil top-N pair berdasar 24h volume dari Binance.
+        Hasil di-cache selama `universe_ttl` detik.
         """
+        fetched_at, cached = self._universe_cache
+        if cached and time.time() - fetched_at < self.universe_ttl:
+            return cached
+
         # via CCXT: markets = exchange.fetch_tickers()
-        tickers = client.get_ticker_24hr()  # list of dicts
-        # filter hanya USDT pairs dan sort by quoteVolume
+        tickers = self._get_client().get_ticker_24hr()  # list of dicts
+        # filter hanya USDT pairs; nlargest dengan key stabil, jadi volume
+        # yang sama tetap mengikuti urutan ticker (sama seperti sorted())
         usdt = [t for t in tickers if t['symbol'].endswith("USDT")]
-        sorted_ = sorted(usdt, key=lambda x: float(x['quoteVolume']), reverse=True)
-        return [t['symbol'] for t in sorted_[:self.universe_size]]
+        top = heapq.nlargest(self.universe_size, usdt,
+                             key=lambda t: float(t['quoteVolume']))
+        universe = [t['symbol'] for t in top]
+        self._universe_cache = (time.time(), universe)
+        return universe
+
+    def _get_client(self):
+        """Import Binance client secara lazy agar selector bisa dibuat tanpa koneksi."""
+        if self._client is None:
+            from cqio.binance_client import client  # kita bisa pakai ccxt/python-binance
+            self._client = client
+        return self._client
 
     def choose(self) -> list[str]:
         # 1. bangun universe dinamis
         universe = self._fetch_top_universe()
 
-        # 2. hitung skor UCB untuk tiap pair di universe
-        scores = {}
-        for p in universe:
-            st = self.stats[p]
-            if st['N'] == 0:
-                scores[p] = float('inf')
-            else:
-                mean_r = st['reward']/st['N']
-                bonus = math.sqrt(2 * math.log(self.N_total) / st['N'])
-                scores[p] = mean_r + bonus
-
-        # 3. pilih top-k
-        topk = sorted(scores, key=scores.get, reverse=True)[:self.k]
+        # 2. hitung skor UCB untuk tiap pair di universe (vektor numpy)
+        m = len(universe)
+        N = np.fromiter((self.stats[p]['N'] for p in universe), dtype=np.int64, count=m)
+        reward = np.fromiter((self.stats[p]['reward'] for p in universe), dtype=np.float64, count=m)
+        N_safe = np.maximum(N, 1)
+        log_total = math.log(self.N_total) if self.N_total > 0 else 0.0
+        scores = np.where(N > 0, reward / N_safe + np.sqrt(2 * log_total / N_safe), np.inf)
+
+        # 3. pilih top-k: partition O(M), lalu urutkan k kandidat saja
+        k = min(self.k, m)
+        topk = []
+        if k > 0:
+            kth = np.partition(scores, m - k)[m - k]
+            above = np.flatnonzero(scores > kth)
+            # skor seri di batas: utamakan urutan universe (volume terbesar)
+            ties = np.flatnonzero(scores == kth)[:k - len(above)]
+            idx = np.concatenate([above, ties])
+            idx = idx[np.lexsort((idx, -scores[idx]))]
+            topk = [universe[i] for i in idx]
         if not topk:
             topk = random.sample(universe, self.k)
 
@@ -2,7 +2,7 @@
 
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.memory import MemoryJobStore
-from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
 from apscheduler.triggers.interval import IntervalTrigger
 from typing import Callable, Any, Optional
 import logging
@@ -16,11 +16,6 @@ jobstores = {
     'default': MemoryJobStore()
 }
 
-# Use a thread pool executor to run jobs in parallel threads
-executors = {
-    'default': ThreadPoolExecutor(max_workers=5)
-}
-
 # Default job settings
 job_defaults = {
     'coalesce': False,       # do not coalesce missed runs
@@ -32,9 +27,24 @@ class Scheduler:
     """
     Wrapper around APScheduler BackgroundScheduler.
     Use add_interval_job() to schedule repeating tasks.
+
+    executor: 'thread' (default) runs jobs in a thread pool, which suits
+        I/O-bound work and NumPy/LightGBM code that releases the GIL.
+        'process' runs jobs in a process pool so CPU-bound pure-Python/pandas
+        jobs are not serialized by the GIL; job functions and their args must
+        then be picklable (module-level callables).
+    workers: size of the pool.
     """
 
-    def __init__(self):
+    def __init__(self, executor: str = 'thread', workers: int = 5):
+        if executor == 'thread':
+            pool = ThreadPoolExecutor(max_workers=workers)
+        elif executor == 'process':
+            pool = ProcessPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown executor '{executor}', expected 'thread' or 'process'")
+        executors = {'default': pool}
+
         self._sched = BackgroundScheduler(
             jobstores=jobstores,
             executors=executors,
@@ -42,7 +52,7 @@ class Scheduler:
             timezone='UTC'
         )
         self._sched.start()
-        logger.info("Scheduler started (in background)")
+        logger.info(f"Scheduler started (in background, {executor} pool x{workers})")
 
     def add_interval_job(
         self,
@@ -1,6 +1,10 @@
 # io/binance_client.py
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from binance.client import Client
@@ -13,6 +17,19 @@ API_SECRET = os.getenv("BINANCE_SECRET_KEY", "")
 # Initialize the Binance REST client
 client = Client(api_key=API_KEY, api_secret=API_SECRET)
 
+# worker threads of fetch_klines_many() get their own client: a Client wraps
+# one requests.Session, which is not thread-safe, and updates its own state
+# (e.g. the timestamp offset) during calls
+_thread_local = threading.local()
+
+def _thread_client() -> Client:
+    """Client private to the calling thread, created on first use."""
+    api = getattr(_thread_local, "client", None)
+    if api is None:
+        # the module client already pinged the server
+        api = _thread_local.client = Client(api_key=API_KEY, api_secret=API_SECRET, ping=False)
+    return api
+
 def fetch_klines(
     symbol: str,
     interval: str,
@@ -23,15 +40,46 @@ def fetch_klines(
     Download historical OHLCV bars for a given symbol/interval.
     Returns a DataFrame indexed by timestamp with columns ['o','h','l','c','v'].
     """
-    klines = client.get_historical_klines(symbol, interval, start_str, end_str or "now UTC")
-    df = pd.DataFrame(klines, columns=[
-        "ts", "o", "h", "l", "c", "v",
-        "close_time", "quote_asset_volume", "n_trades",
-        "taker_buy_base", "taker_buy_quote", "ignore"
-    ])
-    df["ts"] = pd.to_datetime(df["ts"], unit="ms")
-    df = df.set_index("ts")[["o", "h", "l", "c", "v"]].astype(float)
-    return df
+    return _fetch_klines(client, symbol, interval, start_str, end_str)
+
+def _fetch_klines(api: Client, symbol: str, interval: str, start_str: str, end_str: str) -> pd.DataFrame:
+    klines = api.get_historical_klines(symbol, interval, start_str, end_str or "now UTC")
+    # rows are [open_time, o, h, l, c, v, close_time, ...]; only the first six are used
+    arr = np.asarray(klines, dtype=object) if klines else np.empty((0, 6), dtype=object)
+    index = pd.DatetimeIndex(pd.to_datetime(arr[:, 0].astype(np.int64), unit="ms"), name="ts")
+    return pd.DataFrame({
+        "o": arr[:, 1].astype(np.float64),
+        "h": arr[:, 2].astype(np.float64),
+        "l": arr[:, 3].astype(np.float64),
+        "c": arr[:, 4].astype(np.float64),
+        "v": arr[:, 5].astype(np.float64),
+    }, index=index)
+
+def fetch_klines_many(
+    symbols: list[str],
+    interval: str,
+    start_str: str = "1 day ago UTC",
+    end_str: str = None,
+    max_workers: int = 8
+) -> dict[str, pd.DataFrame]:
+    """
+    fetch_klines() for several symbols at once.
+    The REST calls are I/O-bound, so they run on a thread pool and the total
+    wait is roughly one round trip instead of one per symbol. Each worker
+    thread uses its own Client rather than the shared module one.
+    Returns {symbol: DataFrame}; an error for any symbol is re-raised.
+    """
+    if not symbols:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+        futures = {
+            sym: pool.submit(_fetch_klines_in_thread, sym, interval, start_str, end_str)
+            for sym in symbols
+        }
+        return {sym: fut.result() for sym, fut in futures.items()}
+
+def _fetch_klines_in_thread(symbol: str, interval: str, start_str: str, end_str: str) -> pd.DataFrame:
+    return _fetch_klines(_thread_client(), symbol, interval, start_str, end_str)
 
 def get_account_balance(asset: str = "USDT") -> float:
     """
@@ -1,9 +1,11 @@
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import requests
 import pandas as pd
+from requests.adapters import HTTPAdapter
 
 # Fear & Greed Index (no API key required)
 FNG_URL = "https://api.alternative.me/fng/?limit=1"
@@ -11,20 +13,42 @@ FNG_URL = "https://api.alternative.me/fng/?limit=1"
 # CryptoPanic (requires free API key; optional)
 CP_URL_TEMPLATE = "https://cryptopanic.com/api/v1/posts/?auth_token={token}&kind=news"
 
+# Fear & Greed updates daily, CryptoPanic within minutes; ticks inside the TTL
+# reuse the last successful fetch instead of hitting the API again
+FNG_TTL = 3600.0
+CP_TTL = 60.0
+_fng_cache = None   # (fetch_time, value)
+_cp_cache = {}      # (token, limit) -> (fetch_time, value)
+
+# one pooled keep-alive session, so repeated ticks reuse the TCP/TLS connection
+SESSION = requests.Session()
+SESSION.headers["Connection"] = "keep-alive"
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=2))
+
+# both sources are blocking HTTP GETs; fetch them side by side
+_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sentiment")
+
 def fear_greed_score() -> float:
     """
     Fetch the Fear & Greed Index.
     Returns a float in [0,1], where 0 = extreme fear, 1 = extreme greed.
+    Results are cached for FNG_TTL seconds.
     """
+    global _fng_cache
+    now = time.monotonic()
+    if _fng_cache is not None and now - _fng_cache[0] < FNG_TTL:
+        return _fng_cache[1]
     try:
-        resp = requests.get(FNG_URL, timeout=5)
+        resp = SESSION.get(FNG_URL, timeout=5)
         data = resp.json().get("data", [])
         if not data:
             return 0.5
         # value is 0–100
-        return float(data[0].get("value", 50)) / 100.0
+        value = float(data[0].get("value", 50)) / 100.0
     except Exception:
         return 0.5  # fallback neutral
+    _fng_cache = (now, value)
+    return value
 
 def crypto_panic_score(token: Optional[str] = None, limit: int = 20) -> float:
     """
@@ -34,11 +58,17 @@ def crypto_panic_score(token: Optional[str] = None, limit: int = 20) -> float:
     
     Returns average sentiment in [-1, 1]:
       +1 for positive, –1 for negative, 0 for neutral.
+    Results are cached per (token, limit) for CP_TTL seconds.
     """
     api_token = token or os.getenv("CRYPTOPANIC_TOKEN", "")
+    key = (api_token, limit)
+    now = time.monotonic()
+    hit = _cp_cache.get(key)
+    if hit is not None and now - hit[0] < CP_TTL:
+        return hit[1]
     url = CP_URL_TEMPLATE.format(token=api_token)
     try:
-        resp = requests.get(f"{url}&public=true&kind=news&limit={limit}", timeout=5)
+        resp = SESSION.get(f"{url}&public=true&kind=news&limit={limit}", timeout=5)
         results = resp.json().get("results", [])
         if not results:
             return 0.0
@@ -51,9 +81,11 @@ def crypto_panic_score(token: Optional[str] = None, limit: int = 20) -> float:
             elif s == "negative":
                 score -= 1
             count += 1
-        return score / max(1, count)
+        value = score / max(1, count)
     except Exception:
         return 0.0  # fallback neutral
+    _cp_cache[key] = (now, value)
+    return value
 
 def aggregate_sentiment(limit: int = 20) -> pd.DataFrame:
     """
@@ -65,9 +97,11 @@ def aggregate_sentiment(limit: int = 20) -> pd.DataFrame:
       - fear_greed (float)
       - crypto_panic (float)
     """
-    now = pd.Timestamp.utcnow().floor("T")
-    fg = fear_greed_score()
-    cp = crypto_panic_score(limit=limit)
+    now = pd.Timestamp.utcnow().floor("min")
+    fg_fut = _POOL.submit(fear_greed_score)
+    cp_fut = _POOL.submit(crypto_panic_score, limit=limit)
+    fg = fg_fut.result()
+    cp = cp_fut.result()
     df = pd.DataFrame({
         "timestamp": [now],
         "fear_greed": [fg],
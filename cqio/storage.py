@@ -2,32 +2,79 @@
 
 import os
 import sqlite3
+from itertools import chain, repeat
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 import pyarrow.parquet as pq
 
-from config import DATA_PATH
+from config import DATA_PATH, OHLCV_BACKEND
+
+try:  # optional: ADBC returns query results as Arrow tables, no per-row tuples
+    import adbc_driver_sqlite.dbapi as adbc
+except ImportError:
+    adbc = None
+
+_OHLCV_COLS = ['open', 'high', 'low', 'close', 'volume']
+
+_OHLCV_INSERT = "INSERT OR REPLACE INTO ohlcv (symbol, ts, open, high, low, close, volume) VALUES "
+_OHLCV_ROW = "(?, ?, ?, ?, ?, ?, ?)"
+
+# hive layout: <DATA_PATH>/ohlcv/symbol=BTCUSDT/year=2024/part-*.parquet
+_OHLCV_PARTITIONING = ds.partitioning(
+    pa.schema([('symbol', pa.string()), ('year', pa.int32())]),
+    flavor='hive'
+)
 
 class PersistentStorage:
     """
     Fallback storage for OHLCV and feature DataFrames.
     Persists to:
-      - SQLite (for OHLCV time-series)
+      - SQLite or a partitioned Parquet dataset (for OHLCV time-series)
       - Parquet files (for arbitrary DataFrames)
+
+    Parameters:
+    -----------
+    backend : str
+        'sqlite' (single storage.db) or 'parquet' (one dataset partitioned by
+        symbol and year, read with partition pruning and predicate pushdown).
+        Defaults to config.OHLCV_BACKEND.
     """
-    def __init__(self):
+    def __init__(self, backend: str = None):
+        backend = backend or OHLCV_BACKEND
+        if backend not in ('sqlite', 'parquet'):
+            raise ValueError(f"Unknown OHLCV backend: {backend!r}")
+        self.backend = backend
+
         # ensure base data path exists
         self.base_path = Path(DATA_PATH)
         self.base_path.mkdir(parents=True, exist_ok=True)
 
-        # set up SQLite for OHLCV
-        self.db_path = self.base_path / "storage.db"
-        self.conn = sqlite3.connect(self.db_path)
-        self._init_sqlite()
+        self._adbc_conn = None
+        if backend == 'parquet':
+            self.ohlcv_root = self.base_path / "ohlcv"
+            self.conn = None
+        else:
+            # set up SQLite for OHLCV
+            self.db_path = self.base_path / "storage.db"
+            self.conn = sqlite3.connect(self.db_path)
+            self._init_sqlite()
 
     def _init_sqlite(self):
+        # WAL + NORMAL: bulk ingests commit without an fsync per transaction
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        # rows per multi-row INSERT, bounded by the bound-variable limit (7 per row)
+        try:
+            max_vars = self.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        except AttributeError:  # Python < 3.11: assume SQLite's historical default
+            max_vars = 999
+        self._rows_per_insert = max(1, min(500, max_vars // 7))
         c = self.conn.cursor()
         c.execute("""
             CREATE TABLE IF NOT EXISTS ohlcv (
@@ -39,33 +86,48 @@ class PersistentStorage:
         """)
         self.conn.commit()
 
-    # --- SQLite OHLCV methods ---
+    # --- OHLCV methods ---
 
-    def save_ohlcv(self, symbol: str, df: pd.DataFrame):
+    def save_ohlcv(self, symbol: str, df: pd.DataFrame, method: str = "multi"):
         """
-        Save an OHLCV DataFrame to SQLite.
+        Save an OHLCV DataFrame to the configured backend.
         Assumes df.index is a DatetimeIndex named 'ts', and columns ['o','h','l','c','v'].
+        Rows whose timestamp already exists for `symbol` are replaced.
+
+        method (SQLite only): 'multi' packs many rows into each
+        INSERT ... VALUES (...), (...) statement; 'executemany' binds one row per step.
         """
-        df2 = df.copy().reset_index().rename(columns={
-            'ts': 'ts',
-            'o': 'open',
-            'h': 'high',
-            'l': 'low',
-            'c': 'close',
-            'v': 'volume'
-        })
-        # convert timestamps to integer seconds
-        df2['ts'] = (df2['ts'].astype('int64') // 1_000_000_000).astype(int)
-        records = [
-            (symbol, int(row.ts), row.open, row.high, row.low, row.close, row.volume)
-            for row in df2.itertuples()
-        ]
-        c = self.conn.cursor()
-        c.executemany(
-            "INSERT OR REPLACE INTO ohlcv (symbol, ts, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            records
+        if self.backend == 'parquet':
+            return self._save_ohlcv_parquet(symbol, df)
+        if method not in ("multi", "executemany"):
+            raise ValueError(f"Unknown insert method: {method!r}")
+        # convert timestamps to integer seconds (independent of index resolution)
+        ts = df.index.to_numpy(dtype='datetime64[s]').astype(np.int64)
+        # feed rows straight from the column arrays, no per-row objects
+        records = zip(
+            repeat(symbol),
+            ts.tolist(),
+            df['o'].to_numpy(dtype=np.float64).tolist(),
+            df['h'].to_numpy(dtype=np.float64).tolist(),
+            df['l'].to_numpy(dtype=np.float64).tolist(),
+            df['c'].to_numpy(dtype=np.float64).tolist(),
+            df['v'].to_numpy(dtype=np.float64).tolist(),
         )
-        self.conn.commit()
+        # one explicit transaction for the whole batch
+        with self.conn:
+            if method == "executemany":
+                self.conn.executemany(_OHLCV_INSERT + _OHLCV_ROW, records)
+            else:
+                self._insert_multi(list(records))
+
+    def _insert_multi(self, rows: list):
+        """INSERT OR REPLACE `rows` using multi-row VALUES lists (fewer statement steps)."""
+        step = self._rows_per_insert
+        full_sql = _OHLCV_INSERT + ", ".join([_OHLCV_ROW] * step)
+        for i in range(0, len(rows), step):
+            part = rows[i:i + step]
+            sql = full_sql if len(part) == step else _OHLCV_INSERT + ", ".join([_OHLCV_ROW] * len(part))
+            self.conn.execute(sql, list(chain.from_iterable(part)))
 
     def load_ohlcv(
         self,
@@ -77,6 +139,8 @@ class PersistentStorage:
         Load OHLCV for `symbol` between optional Unix timestamp bounds.
         Returns DataFrame indexed by pd.DatetimeIndex with columns ['open','high','low','close','volume'].
         """
+        if self.backend == 'parquet':
+            return self._load_ohlcv_parquet(symbol, start_ts, end_ts)
         query = "SELECT ts, open, high, low, close, volume FROM ohlcv WHERE symbol = ?"
         params = [symbol]
         if start_ts is not None:
@@ -86,28 +150,116 @@ class PersistentStorage:
             query += " AND ts <= ?"
             params.append(end_ts)
         query += " ORDER BY ts"
-        df = pd.read_sql_query(query, self.conn, params=params)
+        # PRIMARY KEY(symbol, ts) already backs this range scan and its ordering
+        if adbc is not None:
+            df = self._query_arrow(query, params)
+        else:
+            # fetch the tuples directly instead of going through read_sql_query
+            rows = self.conn.execute(query, params).fetchall()
+            df = pd.DataFrame.from_records(rows, columns=['ts','open','high','low','close','volume'])
         if df.empty:
             return pd.DataFrame(columns=['open','high','low','close','volume'])
         df['ts'] = pd.to_datetime(df['ts'], unit='s')
         return df.set_index('ts')[['open','high','low','close','volume']]
 
+    def _query_arrow(self, query: str, params: list) -> pd.DataFrame:
+        """Run a read query over ADBC and convert the Arrow result in one go."""
+        if self._adbc_conn is None:
+            # separate reader connection; autocommit so a read never pins an
+            # old WAL snapshot and later writes stay visible
+            self._adbc_conn = adbc.connect(str(self.db_path), autocommit=True)
+        with self._adbc_conn.cursor() as cur:
+            cur.execute(query, params)
+            table = cur.fetch_arrow_table()
+        return table.to_pandas(self_destruct=True)
+
+    # --- Parquet OHLCV backend ---
+
+    def _ohlcv_dataset(self):
+        return ds.dataset(
+            str(self.ohlcv_root), format='parquet',
+            partitioning=_OHLCV_PARTITIONING
+        )
+
+    def _save_ohlcv_parquet(self, symbol: str, df: pd.DataFrame):
+        ts = df.index.to_numpy(dtype='datetime64[s]').astype(np.int64)
+        new = pd.DataFrame({
+            'ts':     ts,
+            'open':   df['o'].to_numpy(dtype=np.float64),
+            'high':   df['h'].to_numpy(dtype=np.float64),
+            'low':    df['l'].to_numpy(dtype=np.float64),
+            'close':  df['c'].to_numpy(dtype=np.float64),
+            'volume': df['v'].to_numpy(dtype=np.float64),
+        })
+        if new.empty:
+            return
+        years = np.unique(ts.astype('datetime64[s]').astype('datetime64[Y]').astype(np.int64) + 1970)
+
+        # partitions are rewritten whole, so merge in what the touched years hold
+        if self.ohlcv_root.exists():
+            old = self._ohlcv_dataset().to_table(
+                columns=['ts'] + _OHLCV_COLS,
+                filter=(ds.field('symbol') == symbol) & ds.field('year').isin(years.tolist())
+            ).to_pandas()
+            if not old.empty:
+                new = pd.concat([old, new], ignore_index=True)
+        new = new.drop_duplicates('ts', keep='last').sort_values('ts', kind='stable')
+
+        # sorted by ts within each file, so range filters skip row groups via statistics
+        table = pa.Table.from_pandas(new, preserve_index=False)
+        year = pc.cast(pc.year(pc.cast(table['ts'], pa.timestamp('s'))), pa.int32())
+        table = table.append_column('symbol', pa.array([symbol] * len(table), pa.string()))
+        table = table.append_column('year', year)
+        pq.write_to_dataset(
+            table, str(self.ohlcv_root),
+            partitioning=_OHLCV_PARTITIONING,
+            existing_data_behavior='delete_matching'
+        )
+
+    def _load_ohlcv_parquet(self, symbol: str, start_ts: int = None, end_ts: int = None) -> pd.DataFrame:
+        if not self.ohlcv_root.exists():
+            return pd.DataFrame(columns=_OHLCV_COLS)
+        # the symbol/year terms prune partitions, the ts terms push down into row groups
+        flt = ds.field('symbol') == symbol
+        if start_ts is not None:
+            flt &= ds.field('ts') >= start_ts
+            flt &= ds.field('year') >= pd.Timestamp(start_ts, unit='s').year
+        if end_ts is not None:
+            flt &= ds.field('ts') <= end_ts
+            flt &= ds.field('year') <= pd.Timestamp(end_ts, unit='s').year
+        table = self._ohlcv_dataset().to_table(columns=['ts'] + _OHLCV_COLS, filter=flt)
+        if table.num_rows == 0:
+            return pd.DataFrame(columns=_OHLCV_COLS)
+        df = table.sort_by('ts').to_pandas()
+        df['ts'] = pd.to_datetime(df['ts'], unit='s')
+        return df.set_index('ts')[_OHLCV_COLS]
+
     # --- Parquet methods for arbitrary DataFrames ---
 
     def save_parquet(self, filename: str, df: pd.DataFrame):
         """
         Save any DataFrame to <DATA_PATH>/<filename>.pq
+        (zstd-compressed, dictionary-encoded, with column statistics).
         """
         path = self.base_path / f"{filename}.pq"
         table = pa.Table.from_pandas(df)
-        pq.write_table(table, str(path))
+        pq.write_table(
+            table, str(path),
+            compression='zstd',
+            compression_level=3,
+            use_dictionary=True,
+            write_statistics=True,
+            row_group_size=100_000
+        )
 
-    def load_parquet(self, filename: str) -> pd.DataFrame:
+    def load_parquet(self, filename: str, columns: list = None) -> pd.DataFrame:
         """
         Load a DataFrame from <DATA_PATH>/<filename>.pq
+        If `columns` is given, only those columns are read from disk.
         """
         path = self.base_path / f"{filename}.pq"
         if not path.exists():
             raise FileNotFoundError(f"Parquet file not found: {path}")
-        table = pq.read_table(str(path))
+        # use_pandas_metadata keeps the stored index when pruning columns
+        table = pq.read_table(str(path), columns=columns, use_pandas_metadata=True)
         return table.to_pandas()
@@ -24,32 +24,21 @@ class FeatureUnion:
         )
         self._is_fitted = False
 
-    def _prepare_hmm_input(self, df_tech: pd.DataFrame) -> np.ndarray:
-        """Build the observation matrix for HMM.
+    @staticmethod
+    def _ffill_atr(atr: pd.Series) -> np.ndarray:
+        """ATR forward-filled, 0 before the first value."""
+        return atr.ffill().fillna(0.0).to_numpy(dtype=np.float64)
+
+    def _prepare_hmm_input(self, close: np.ndarray, atr_ff: np.ndarray) -> np.ndarray:
+        """Build the observation matrix for HMM from raw close / filled ATR arrays.
 
         Included features:
-          - returns (% change of close)
-          - ATR
-          - Bollinger Band width
-          - MACD difference
-          - OBV change
-          - intraday volatility
+          - returns (% change of close, 0 for the first bar or a zero close)
+          - ATR (already forward-filled, see _ffill_atr)
         """
-        ret = df_tech['c'].pct_change().fillna(0.0).values
-        atr = df_tech['atr'].ffill().fillna(0.0).values
-        bb_width = df_tech['bb_width'].ffill().fillna(0.0).values
-        macd_diff = df_tech['macd_diff'].fillna(0.0).values
-        obv_change = df_tech['obv'].pct_change().fillna(0.0).values
-        intraday_vol = df_tech['intraday_vol'].fillna(0.0).values
-
-        return np.column_stack([
-            ret,
-            atr,
-            bb_width,
-            macd_diff,
-            obv_change,
-            intraday_vol,
-        ])
+        ret = np.zeros_like(close)
+        np.divide(close[1:] - close[:-1], close[:-1], out=ret[1:], where=close[:-1] != 0)
+        return np.column_stack([ret, atr_ff])
 
     def fit(self, df: pd.DataFrame):
         """
@@ -59,7 +48,10 @@ class FeatureUnion:
         # 1) compute technicals
         df_tech = make_technical_features(df)
         # 2) prepare HMM observations
-        X = self._prepare_hmm_input(df_tech)
+        X = self._prepare_hmm_input(
+            df_tech['c'].to_numpy(dtype=np.float64),
+            self._ffill_atr(df_tech['atr'])
+        )
         # 3) fit HMM
         self.regime_filter.fit(X)
         self._is_fitted = True
@@ -70,8 +62,7 @@ class FeatureUnion:
         Apply the technical feature pipeline and HMM filter to new data.
         Returns a DataFrame with:
           - original OHLCV columns
-          - 'atr', 'rsi', 'stoch_k', 'stoch_d',
-            'bb_width', 'macd_diff', 'obv', 'intraday_vol'
+          - 'atr' (forward-filled), 'rsi', 'stoch_k', 'stoch_d'
           - 'state_0', ..., 'state_{n_states-1}' probabilities
         """
         if not self._is_fitted:
@@ -80,17 +71,18 @@ class FeatureUnion:
         # 1) technical indicators
         df_tech = make_technical_features(df)
 
-        # 2) HMM regime probabilities
-        X = self._prepare_hmm_input(df_tech)
+        # 2) HMM regime probabilities; the filled ATR is shared with the output
+        atr_ff = self._ffill_atr(df_tech['atr'])
+        X = self._prepare_hmm_input(df_tech['c'].to_numpy(dtype=np.float64), atr_ff)
+        df_tech['atr'] = atr_ff
         probs = self.regime_filter.predict_proba(X)
-        cols = [f"state_{i}" for i in range(self.n_states)]
-        df_probs = pd.DataFrame(probs, index=df_tech.index, columns=cols)
 
-        # 3) concatenate
-        df_feats = pd.concat([df_tech, df_probs], axis=1)
+        # 3) append state columns in place (df_tech is already our own copy)
+        for i in range(self.n_states):
+            df_tech[f"state_{i}"] = probs[:, i]
 
         # 4) drop any initial NaNs and return
-        return df_feats.dropna()
+        return df_tech.dropna()
 
     def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """
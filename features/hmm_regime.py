@@ -1,8 +1,16 @@
 # features/hmm_regime.py
 
+import hashlib
+
 import numpy as np
 from hmmlearn.hmm import GaussianHMM
-import pickle
+import joblib
+
+try:  # optional: lz4 is much faster to (de)compress than zlib
+    import lz4  # noqa: F401
+    _COMPRESS = ("lz4", 3)
+except ImportError:
+    _COMPRESS = ("zlib", 3)
 
 class RegimeFilter:
     """
@@ -18,46 +26,54 @@ class RegimeFilter:
             covariance_type=covariance_type,
             random_state=random_state
         )
+        # (input digest, posteriors) of the last predict_proba call
+        self._proba_cache = None
 
     def fit(self, X: np.ndarray):
         """
         Fit the HMM to the feature matrix X.
         X should be shape (n_samples, n_features), e.g., returns & volatility.
         """
-        self.model.fit(X)
+        self.model.fit(np.ascontiguousarray(X, dtype=np.float64))
+        self._proba_cache = None
 
     def predict_states(self, X: np.ndarray) -> np.ndarray:
         """
         Predict the most likely state sequence for X.
         Returns an array of shape (n_samples,) with state indices [0..n_states-1].
         """
-        return self.model.predict(X)
+        return self.model.predict(np.ascontiguousarray(X, dtype=np.float64))
 
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
         """
         Compute the posterior probability of each state for each sample.
         Returns an array of shape (n_samples, n_states).
+        Repeating the previous call with identical X skips forward-backward.
         """
-        return self.model.predict_proba(X)
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        key = (X.shape, hashlib.sha1(X).digest())
+        if self._proba_cache is not None and self._proba_cache[0] == key:
+            return self._proba_cache[1].copy()
+        probs = self.model.predict_proba(X)
+        self._proba_cache = (key, probs)
+        return probs.copy()
 
     def save(self, path: str):
         """
-        Persist the trained HMM to disk via pickle.
+        Persist the trained HMM to disk via joblib (lz4 if installed, else zlib).
         """
-        with open(path, "wb") as f:
-            pickle.dump({
-                "n_states": self.n_states,
-                "covariance_type": self.model.covariance_type,
-                "model": self.model
-            }, f)
+        joblib.dump({
+            "n_states": self.n_states,
+            "covariance_type": self.model.covariance_type,
+            "model": self.model
+        }, path, compress=_COMPRESS)
 
     @classmethod
     def load(cls, path: str) -> "RegimeFilter":
         """
-        Load a saved HMM from disk.
+        Load a saved HMM from disk (also reads files written by the old pickle format).
         """
-        with open(path, "rb") as f:
-            data = pickle.load(f)
+        data = joblib.load(path)
         inst = cls(n_states=data["n_states"], covariance_type=data["covariance_type"])
         inst.model = data["model"]
         return inst
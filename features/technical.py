@@ -1,7 +1,36 @@
 # features/technical.py
 
+import numpy as np
 import pandas as pd
-import ta  # pandas-ta or ta-lib wrapper
+import talib  # compiled C indicators, operate on raw float64 arrays
+
+def _hlc(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Extract high/low/close as contiguous float64 arrays for TA-Lib."""
+    return (
+        df['h'].to_numpy(dtype=np.float64),
+        df['l'].to_numpy(dtype=np.float64),
+        df['c'].to_numpy(dtype=np.float64),
+    )
+
+def _add_atr_inplace(df: pd.DataFrame, period: int = 14) -> None:
+    """Assign df['atr'] without copying; expects columns ['h','l','c']."""
+    high, low, close = _hlc(df)
+    df['atr'] = talib.ATR(high, low, close, timeperiod=period)
+
+def _add_rsi_inplace(df: pd.DataFrame, period: int = 14) -> None:
+    """Assign df['rsi'] without copying; expects column 'c'."""
+    df['rsi'] = talib.RSI(df['c'].to_numpy(dtype=np.float64), timeperiod=period)
+
+def _add_stochastic_inplace(df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> None:
+    """Assign df['stoch_k'] / df['stoch_d'] without copying; expects columns ['h','l','c']."""
+    high, low, close = _hlc(df)
+    # fast stochastic: raw %K and its SMA as %D
+    df['stoch_k'], df['stoch_d'] = talib.STOCHF(
+        high, low, close,
+        fastk_period=k_period,
+        fastd_period=d_period,
+        fastd_matype=talib.MA_Type.SMA
+    )
 
 def add_atr(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     """
@@ -9,12 +38,7 @@ def add_atr(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     Expects df to have columns ['h','l','c'].
     """
     df = df.copy()
-    df['atr'] = ta.volatility.average_true_range(
-        high=df['h'],
-        low=df['l'],
-        close=df['c'],
-        window=period
-    )
+    _add_atr_inplace(df, period)
     return df
 
 def add_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
@@ -23,10 +47,7 @@ def add_rsi(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     Expects df to have column 'c' (close).
     """
     df = df.copy()
-    df['rsi'] = ta.momentum.rsi(
-        close=df['c'],
-        window=period
-    )
+    _add_rsi_inplace(df, period)
     return df
 
 def add_stochastic(df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> pd.DataFrame:
@@ -35,15 +56,7 @@ def add_stochastic(df: pd.DataFrame, k_period: int = 14, d_period: int = 3) -> p
     Expects df to have columns ['h','l','c'].
     """
     df = df.copy()
-    stoch = ta.momentum.StochasticOscillator(
-        high=df['h'],
-        low=df['l'],
-        close=df['c'],
-        window=k_period,
-        smooth_window=d_period
-    )
-    df['stoch_k'] = stoch.stoch()
-    df['stoch_d'] = stoch.stoch_signal()
+    _add_stochastic_inplace(df, k_period, d_period)
     return df
 
 def make_technical_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -54,7 +67,9 @@ def make_technical_features(df: pd.DataFrame) -> pd.DataFrame:
       - Stochastic %K(14), %D(3)
     Returns a new DataFrame with added columns.
     """
-    df = add_atr(df)
-    df = add_rsi(df)
-    df = add_stochastic(df)
+    # single copy; the helpers then write into it in place
+    df = df.copy()
+    _add_atr_inplace(df, 14)
+    _add_rsi_inplace(df, 14)
+    _add_stochastic_inplace(df, 14, 3)
     return df
@@ -1,11 +1,21 @@
 """Utilities for live trading loop."""
 
 from .trader import main_loop
-from .risk import get_risk_frac, dynamic_sl_tp, compute_position_size
+from .risk import (
+    get_risk_frac,
+    get_risk_frac_vec,
+    dynamic_sl_tp,
+    dynamic_sl_tp_vec,
+    compute_position_size,
+    compute_position_size_vec,
+)
 
 __all__ = [
     "main_loop",
     "get_risk_frac",
+    "get_risk_frac_vec",
     "dynamic_sl_tp",
+    "dynamic_sl_tp_vec",
     "compute_position_size",
+    "compute_position_size_vec",
 ]
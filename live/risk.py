@@ -1,18 +1,31 @@
 # live/risk.py
 
+import numpy as np
+
 from config import RISK_THRESHOLDS
-from core.leverage import choose_leverage
+from core.leverage import choose_leverage_batch
+
+# Tier lookup arrays derived from RISK_THRESHOLDS (sorted by upper bound)
+_BOUNDS, _FRACS = (np.asarray(a, dtype=np.float64) for a in zip(*RISK_THRESHOLDS))
 
 def get_risk_frac(balance_usdt: float) -> float:
     """
     Return adaptive risk fraction based on current equity tiers defined in RISK_THRESHOLDS.
     RISK_THRESHOLDS is a list of (equity_upper_bound, risk_fraction) tuples.
     """
-    for bound, frac in RISK_THRESHOLDS:
-        if balance_usdt < bound:
-            return frac
-    # Fallback, should not happen due to infinite upper bound
-    return RISK_THRESHOLDS[-1][1]
+    # first tier with balance < bound; past the last bound falls back to the last tier
+    idx = min(int(_BOUNDS.searchsorted(balance_usdt, side='right')), len(_FRACS) - 1)
+    return float(_FRACS[idx])
+
+def get_risk_frac_vec(balances: np.ndarray) -> np.ndarray:
+    """
+    Vectorized get_risk_frac() over an array of balances (e.g. an equity history).
+    """
+    idx = np.minimum(
+        _BOUNDS.searchsorted(np.asarray(balances, dtype=np.float64), side='right'),
+        len(_FRACS) - 1
+    )
+    return _FRACS[idx]
 
 def dynamic_sl_tp(
     entry_price: float,
@@ -39,9 +52,22 @@ def dynamic_sl_tp(
     sl_price : float
     tp_price : float
     """
-    sl_price = entry_price - sl_multiplier * atr
-    tp_price = entry_price + tp_multiplier * atr
-    return sl_price, tp_price
+    sl_price, tp_price = dynamic_sl_tp_vec(entry_price, atr, sl_multiplier, tp_multiplier)
+    return float(sl_price[0]), float(tp_price[0])
+
+def dynamic_sl_tp_vec(
+    entry_price: np.ndarray,
+    atr: np.ndarray,
+    sl_multiplier: float = 1.2,
+    tp_multiplier: float = 2.4
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized dynamic_sl_tp() for many symbols at once.
+    `entry_price` and `atr` broadcast against each other; returns (sl_price, tp_price) arrays.
+    """
+    entry_price = np.atleast_1d(np.asarray(entry_price, dtype=np.float64))
+    atr = np.asarray(atr, dtype=np.float64)
+    return entry_price - sl_multiplier * atr, entry_price + tp_multiplier * atr
 
 def compute_position_size(
     balance_usdt: float,
@@ -72,14 +98,34 @@ def compute_position_size(
     qty_base : float
         Position size in base asset units.
     """
+    leverage, qty_usd, qty_base = compute_position_size_vec(
+        balance_usdt, entry_price, atr, min_notional=min_notional
+    )
+    return int(leverage[0]), float(qty_usd[0]), float(qty_base[0])
+
+def compute_position_size_vec(
+    balance_usdt: np.ndarray,
+    entry_price: np.ndarray,
+    atr: np.ndarray,
+    min_notional: float = 5.0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized compute_position_size() for many symbols at once.
+    Inputs broadcast against each other (e.g. one balance, one price/ATR per pair);
+    returns (leverage int32, qty_usd, qty_base) arrays.
+    """
+    balance_usdt = np.atleast_1d(np.asarray(balance_usdt, dtype=np.float64))
+    entry_price = np.asarray(entry_price, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+
     # 1. Determine risk fraction based on current balance
-    risk_frac = get_risk_frac(balance_usdt)
+    risk_frac = get_risk_frac_vec(balance_usdt)
 
     # 2. Compute stop-loss distance (ATR-based)
     stop_dist = 1.2 * atr
 
     # 3. Use choose_leverage to satisfy min_notional and risk fraction
-    leverage, qty_usd = choose_leverage(
+    leverage, qty_usd = choose_leverage_batch(
         balance_usdt,
         risk_frac,
         stop_dist,
@@ -1,10 +1,21 @@
 # live/trader.py
 
 import os
+
+# single-row predicts and a scheduler loop gain nothing from OpenMP/BLAS
+# thread pools, only wake-up overhead; must be set before numpy/lightgbm
+# load. Training threads are unaffected: LightGBM passes an explicit
+# num_threads from n_jobs.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
 import time
 import logging
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
+from binance.helpers import interval_to_milliseconds
+
 from config import (
     INTERVAL,
     MAX_POSITION_USDT,
@@ -17,13 +28,13 @@ from core.scheduler import Scheduler
 from core.cache_manager import TempCache
 from core.pair_selector import DynamicUCBSelector
 from cqio.binance_client import (
-    fetch_klines,
+    fetch_klines_many,
     get_account_balance,
     place_market_order
 )
 from cqio.sentiment import aggregate_sentiment
 from features.feature_union import FeatureUnion
-from models.policy import PolicyModel
+from models.policy import PolicyModel, SIDE_FLAT, SIDE_LONG, SIDE_SHORT, SIDE_NAMES
 from models.online_update import OnlineUpdater
 from live.risk import get_risk_frac, dynamic_sl_tp, compute_position_size
 
@@ -35,6 +46,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# TA-Lib's Wilder-smoothed ATR/RSI depend on where the series starts and
+# only settle after ~100 bars; fetch enough history that the latest row
+# matches the features the model was trained on (2 days of 1h bars did not)
+LIVE_HISTORY_BARS = 200
+_HISTORY_START = f"{LIVE_HISTORY_BARS * interval_to_milliseconds(INTERVAL) // 60_000} minutes ago UTC"
+
 # --- Components initialization ---
 cache       = TempCache(ttl_min=45)   # temporary OHLCV & HMM cache
 selector    = DynamicUCBSelector(
@@ -46,16 +63,34 @@ featureer   = FeatureUnion(n_states=3)
 policy      = PolicyModel(LIGHTGBM_PARAMS)
 updater     = OnlineUpdater(policy)
 
+# column positions in FeatureUnion output: (columns, feat_idx, state_idx, c_idx, atr_idx)
+_layout = None
+
+def _feature_layout(columns: pd.Index) -> tuple:
+    """Integer indexers for the feature/state/price columns, rebuilt only if the columns change."""
+    global _layout
+    if _layout is None or not _layout[0].equals(columns):
+        is_state = columns.str.startswith("state_")
+        _layout = (
+            columns,
+            np.flatnonzero(~is_state),
+            np.flatnonzero(is_state),
+            columns.get_loc("c"),
+            columns.get_loc("atr"),
+        )
+    return _layout[1:]
+
+# order side per policy decision code
+_ORDER_SIDE = {SIDE_LONG: "buy", SIDE_SHORT: "sell"}
+
+# seconds per Binance interval unit
+_UNIT_SECS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400}
+
 def interval_to_seconds(interval: str) -> int:
     """Convert Binance interval (e.g. '15m', '4h') into seconds."""
-    unit = interval[-1]
-    val = int(interval[:-1])
-    return {
-        'm': val * 60,
-        'h': val * 3600,
-        'd': val * 86400,
-        'w': val * 7 * 86400
-    }.get(unit, 60)
+    unit = _UNIT_SECS.get(interval[-1])
+    # unknown units fall back to one minute, as before
+    return int(interval[:-1]) * unit if unit is not None else 60
 
 def strategy_tick():
     """Single tick: fetch data, select pairs, decide & place orders, retrain policy."""
@@ -75,33 +110,36 @@ def strategy_tick():
         pairs = selector.choose()
         logger.info(" Trading pairs: " + ", ".join(pairs))
 
-        # 4. loop through each symbol
+        # 4. fetch OHLCV for every cache miss concurrently
+        cached = {sym: cache.get_df(sym) for sym in pairs}
+        missing = [sym for sym, df in cached.items() if df is None]
+        fetched = fetch_klines_many(missing, INTERVAL, start_str=_HISTORY_START)
+
+        # 5. loop through each symbol
         for sym in pairs:
-            # 4a. load or fetch OHLCV
-            df = cache.get_df(sym)
+            # 5a. load cached or freshly fetched OHLCV
+            df = cached[sym]
             if df is None:
-                df = fetch_klines(sym, INTERVAL, start_str="2 days ago UTC")
+                df = fetched[sym]
                 cache.put_df(sym, df)
                 # on first-ever fetch, train the HMM on history
                 featureer.fit(df)
 
-            # 4b. compute features & regime probabilities
+            # 5b. compute features & regime probabilities
             feat_df = featureer.transform(df)
-            last = feat_df.iloc[-1]
-            feat_cols  = [c for c in feat_df.columns if not c.startswith("state_")]
-            state_cols = [c for c in feat_df.columns if c.startswith("state_")]
-            feat_vec   = last[feat_cols].values.reshape(1, -1)
-            prob_vec   = last[state_cols].values
+            feat_idx, state_idx, c_idx, atr_idx = _feature_layout(feat_df.columns)
+            last     = feat_df.iloc[-1].to_numpy(dtype=np.float64)
+            feat_vec = last[feat_idx]
+            prob_vec = last[state_idx]  # appended to feat_vec inside decide()
 
-            # 4c. decision from policy
+            # 5c. decision from policy
             decision = policy.decide(feat_vec, prob_vec, risk_aversion=risk_frac)
-            side, size_frac = decision["side"], decision["size"]
-            logger.info(f"  {sym}: decision={side}, size_frac={size_frac:.3f}")
+            logger.info(f"  {sym}: decision={SIDE_NAMES[decision.side]}, size_frac={decision.size:.3f}")
 
-            # 4d. if entry signal, compute SL/TP, leverage, qty, and place order
-            if side != "flat" and size_frac > 0:
-                price = last["c"]
-                atr   = last["atr"]
+            # 5d. if entry signal, compute SL/TP, leverage, qty, and place order
+            if decision.side != SIDE_FLAT and decision.size > 0:
+                price = last[c_idx]
+                atr   = last[atr_idx]
 
                 # calculate stop-loss and take-profit prices
                 sl_price, tp_price = dynamic_sl_tp(price, atr)
@@ -115,16 +153,17 @@ def strategy_tick():
                 )
 
                 # place market order
-                order = place_market_order(sym, side, qty_asset)
+                order_side = _ORDER_SIDE[decision.side]
+                order = place_market_order(sym, order_side, qty_asset)
                 logger.info(
-                    f"   → {side.upper()} {sym}: qty={qty_asset:.6f}, lev={lev}x, "
+                    f"   → {order_side.upper()} {sym}: qty={qty_asset:.6f}, lev={lev}x, "
                     f"SL≈{sl_price:.2f}, TP≈{tp_price:.2f}, orderId={order.get('orderId')}"
                 )
 
                 # (optional) record for online update later:
                 # updater.add_observations(pd.DataFrame(feat_vec), pd.Series([label]))
 
-        # 5. retrain policy model if scheduled
+        # 6. retrain policy model if scheduled
         if updater.should_retrain():
             updater.retrain()
             updater.save_model()
@@ -0,0 +1,50 @@
+# models/_lgbm_fast_build.py
+
+"""
+Build models/_lgbm_fast, a CFFI extension (API mode) through which
+_FastRowPredictor calls LightGBM's single-row fast predict. It is a plain C
+call with pre-cast pointers, skipping ctypes' per-call argument conversion.
+
+    python -m models._lgbm_fast_build
+
+The shim does not link against lib_lightgbm: PolicyModel hands it the address
+of LGBM_BoosterPredictForMatSingleRowFast from the library the lightgbm
+package already loaded. Without the extension the ctypes path is used.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from cffi import FFI
+
+ffibuilder = FFI()
+ffibuilder.cdef("""
+    void set_predict_fn(void *fn);
+    int predict_row(void *fast_config, const double *row, double *out);
+""")
+ffibuilder.set_source("models._lgbm_fast", """
+    #include <stdint.h>
+
+    /* LGBM_BoosterPredictForMatSingleRowFast, see LightGBM's c_api.h */
+    typedef int (*predict_fn_t)(void *fast_config, const void *data,
+                                int64_t *out_len, double *out_result);
+
+    static predict_fn_t predict_fn = NULL;
+
+    static void set_predict_fn(void *fn) {
+        predict_fn = (predict_fn_t)fn;
+    }
+
+    static int predict_row(void *fast_config, const double *row, double *out) {
+        int64_t out_len = 0;
+        return predict_fn(fast_config, row, &out_len, out);
+    }
+""")
+
+if __name__ == "__main__":
+    # build out of tree, keep only the extension module next to policy.py
+    with tempfile.TemporaryDirectory() as build_dir:
+        built = ffibuilder.compile(tmpdir=build_dir)
+        shutil.copy(built, Path(__file__).resolve().parent / os.path.basename(built))
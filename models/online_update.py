@@ -2,7 +2,10 @@
 
 import os
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pickle
 from datetime import datetime, timedelta
 
@@ -21,32 +24,126 @@ class OnlineUpdater:
         model: PolicyModel,
         training_path: str = "data/training_data.parquet",
         window_size: int = 50_000,
-        retrain_interval_days: int = 1
+        retrain_interval_days: int = 1,
+        compact_slack: int = None
     ):
         """
         model: instance of PolicyModel to update
         training_path: where to store accumulated training data
         window_size: max number of rows to keep for training
         retrain_interval_days: how often to retrain (in days)
+        compact_slack: rows allowed beyond window_size before the appended
+                       batches are compacted (default: window_size // 10)
         """
         self.model = model
         self.training_file = Path(training_path)
         self.window_size = window_size
+        self.compact_slack = window_size // 10 if compact_slack is None else compact_slack
         self.retrain_interval = timedelta(days=retrain_interval_days)
         self._last_retrain = datetime.min
 
+        # new batches are appended as small part files next to the compacted
+        # history instead of rewriting it; a single Parquet file cannot be
+        # appended to, its footer is only written on close
+        self._parts_dir = self.training_file.with_name(self.training_file.name + ".parts")
+        self._n_rows = None      # rows on disk (history + parts), counted lazily
+        self._next_part = None   # sequence number of the next part file
+
+        # in-memory ring buffer mirroring the newest window_size rows, so
+        # retrain() never has to read the parquet history back
+        self._ring_X = None
+        self._ring_y = None
+        self._head = 0
+        self._count = 0
+
         # ensure directory exists
         self.training_file.parent.mkdir(parents=True, exist_ok=True)
 
-    def _load_history(self) -> pd.DataFrame:
+    def _part_files(self) -> list[Path]:
+        if not self._parts_dir.exists():
+            return []
+        return sorted(self._parts_dir.glob("part-*.parquet"))
+
+    def _history_files(self) -> list[Path]:
+        files = self._part_files()
         if self.training_file.exists():
-            return pd.read_parquet(self.training_file)
-        else:
+            files.insert(0, self.training_file)
+        return files
+
+    def _count_rows(self) -> int:
+        if self._n_rows is None:
+            # footers only, no data pages are read
+            self._n_rows = sum(pq.ParquetFile(f).metadata.num_rows for f in self._history_files())
+        return self._n_rows
+
+    def _load_history(self) -> pd.DataFrame:
+        files = self._history_files()
+        if not files:
             # empty DataFrame; label column will be added later
             return pd.DataFrame()
+        df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+        # parts may hold up to compact_slack rows beyond the window
+        if len(df) > self.window_size:
+            df = df.iloc[-self.window_size :].reset_index(drop=True)
+        return df
 
     def _save_history(self, df: pd.DataFrame):
-        df.to_parquet(self.training_file, index=False)
+        # replace the compacted file atomically, then drop the merged parts
+        tmp = self.training_file.with_name(self.training_file.name + ".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.training_file)
+        for f in self._part_files():
+            f.unlink()
+        self._n_rows = len(df)
+        self._next_part = 0
+
+    def _rotate_history(self):
+        """Move the history on disk aside, e.g. after a feature width change."""
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        for f in (self.training_file, self._parts_dir):
+            if f.exists():
+                os.replace(f, f.with_name(f"{f.name}.{stamp}.old"))
+        self._n_rows = 0
+        self._next_part = 0
+
+    def _ring_seed(self, n_features: int):
+        """Allocate the ring buffer and fill it from the history on disk."""
+        hist = self._load_history()
+        self._ring_X = np.empty((self.window_size, n_features), dtype=np.float64)
+        self._ring_y = np.empty(self.window_size, dtype=np.int64)
+        self._head = 0
+        self._count = 0
+        if not hist.empty and hist.shape[1] - 1 != n_features:
+            # rows of another width cannot be trained on with the new
+            # observations, and compacting them together would pad the
+            # training file with NaN columns; start over at the new width
+            self._rotate_history()
+        elif not hist.empty:
+            self._ring_push(
+                hist.drop(columns=['label']).to_numpy(dtype=np.float64),
+                hist['label'].to_numpy()
+            )
+
+    def _ring_push(self, X: np.ndarray, y: np.ndarray):
+        """Write rows at the head of the ring, overwriting the oldest."""
+        W = self.window_size
+        if len(X) > W:
+            X, y = X[-W:], y[-W:]
+        idx = (self._head + np.arange(len(X))) % W
+        self._ring_X[idx] = X
+        self._ring_y[idx] = y
+        self._head = (self._head + len(X)) % W
+        self._count = min(self._count + len(X), W)
+
+    def _ring_window(self) -> tuple[np.ndarray, np.ndarray]:
+        """Buffered rows, oldest first."""
+        if self._count < self.window_size:
+            return self._ring_X[:self._count], self._ring_y[:self._count]
+        h = self._head
+        return (
+            np.concatenate([self._ring_X[h:], self._ring_X[:h]]),
+            np.concatenate([self._ring_y[h:], self._ring_y[:h]])
+        )
 
     def add_observations(
         self,
@@ -58,15 +155,36 @@ class OnlineUpdater:
         features: DataFrame of shape (n, m)
         labels: Series of length n with values in {0,1,2}
         """
-        hist = self._load_history()
-        # align and merge
+        X_new = features.to_numpy(dtype=np.float64)
+        if self._ring_X is not None and self._ring_X.shape[1] != X_new.shape[1]:
+            self._ring_X = None
+        if self._ring_X is None:
+            # seed before this batch hits the disk so it is not counted twice
+            self._ring_seed(X_new.shape[1])
+
+        n_rows = self._count_rows()
+        if self._next_part is None:
+            parts = self._part_files()
+            self._next_part = int(parts[-1].stem.split("-")[1]) + 1 if parts else 0
+
+        # align and write the batch as its own part file
         new = features.copy()
         new['label'] = labels.values
-        combined = pd.concat([hist, new], ignore_index=True)
-        # keep only the most recent window_size rows
-        if len(combined) > self.window_size:
-            combined = combined.iloc[-self.window_size :].reset_index(drop=True)
-        self._save_history(combined)
+        self._parts_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.Table.from_pandas(new, preserve_index=False),
+            str(self._parts_dir / f"part-{self._next_part:08d}.parquet"),
+            compression="zstd"
+        )
+        self._next_part += 1
+        self._n_rows = n_rows + len(new)
+        if self._ring_X is not None:
+            self._ring_push(X_new, labels.to_numpy())
+
+        # keep only the most recent window_size rows, compacting once the
+        # appended batches run past the slack
+        if self._n_rows > self.window_size + self.compact_slack:
+            self._save_history(self._load_history())
 
     def should_retrain(self) -> bool:
         """
@@ -79,14 +197,17 @@ class OnlineUpdater:
         Retrain the model on the accumulated data.
         Updates self.model in-place and resets the retrain timer.
         """
-        df = self._load_history()
-        if df.empty or 'label' not in df.columns:
-            # nothing to train on
-            return
-
-        # split features and labels
-        X = df.drop(columns=['label']).values
-        y = df['label'].values
+        if self._ring_X is not None and self._count:
+            X, y = self._ring_window()
+        else:
+            df = self._load_history()
+            if df.empty or 'label' not in df.columns:
+                # nothing to train on
+                return
+
+            # split features and labels
+            X = df.drop(columns=['label']).values
+            y = df['label'].values
 
         # train the policy model
         self.model.train(X, y)
@@ -1,7 +1,228 @@
 # models/policy.py
 
+import ctypes
+import hashlib
+import logging
+import os
+import subprocess
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
 import lightgbm as lgb
 import numpy as np
+from lightgbm.basic import _LIB, _c_str, _safe_call
+
+from config import LGBM_DEVICE
+
+try:  # optional: drops unused categorical values from the trained trees
+    from lightgbmmodeloptimizer import Optimizer as _ModelOptimizer
+except ImportError:
+    _ModelOptimizer = None
+
+try:  # optional: CFFI shim for the single-row call, python -m models._lgbm_fast_build
+    from ._lgbm_fast import ffi as _ffi, lib as _fast_lib
+    _fast_lib.set_predict_fn(_ffi.cast("void *", ctypes.cast(
+        _LIB.LGBM_BoosterPredictForMatSingleRowFast, ctypes.c_void_p).value))
+except ImportError:
+    _fast_lib = None
+
+logger = logging.getLogger(__name__)
+
+# decision side codes, same coding as the training labels
+SIDE_FLAT, SIDE_LONG, SIDE_SHORT = 0, 1, 2
+SIDE_NAMES = ("flat", "long", "short")
+
+class Decision(NamedTuple):
+    """decide() result: side code (SIDE_*) and fraction of equity to allocate."""
+    side: int
+    size: float
+
+# the no-edge result, shared by every flat decision
+FLAT = Decision(SIDE_FLAT, 0.0)
+
+# LightGBM C API constants (c_api.h)
+_C_API_PREDICT_NORMAL = 0
+_C_API_DTYPE_FLOAT64 = 1
+
+# GPU training settings; LightGBM's GPU histogram kernel needs max_bin <= 63
+_GPU_PARAMS = {"device": "gpu", "gpu_platform_id": 0, "gpu_device_id": 0}
+_GPU_MAX_BIN = 63
+
+# one boosting round on a tiny dataset: fails fast on builds without GPU support
+_GPU_PROBE = (
+    "import lightgbm as lgb, numpy as np; "
+    "lgb.train({'device': 'gpu', 'objective': 'binary', 'verbose': -1}, "
+    "lgb.Dataset(np.random.rand(64, 2), np.arange(64) % 2), num_boost_round=1)"
+)
+_gpu_available = None  # probe result, cached per process
+
+def _lightgbm_gpu_available() -> bool:
+    """
+    Whether LightGBM can train on a GPU here. Probed once in a subprocess,
+    since a broken OpenCL driver may crash or hang the process that tries.
+    """
+    global _gpu_available
+    if _gpu_available is None:
+        try:
+            probe = subprocess.run(
+                [sys.executable, "-c", _GPU_PROBE], capture_output=True, timeout=120
+            )
+            _gpu_available = probe.returncode == 0
+        except (OSError, subprocess.TimeoutExpired):
+            _gpu_available = False
+    return _gpu_available
+
+# iterations between pred_early_stop margin checks
+_PRED_EARLY_STOP_FREQ = 10
+
+# minimum share of identical decide() sides before float32 thresholds replace
+# the float64 model
+_FLOAT32_MIN_AGREEMENT = 0.999
+
+def _decision_sides(proba: np.ndarray) -> np.ndarray:
+    """decide() side codes for rows of [flat, long, short] probabilities."""
+    long_p, short_p = proba[:, 1], proba[:, 2]
+    # flat without a strong edge, else the likelier side
+    sides = np.where(long_p > short_p, SIDE_LONG, SIDE_SHORT).astype(np.int8)
+    sides[np.maximum(long_p, short_p) < 0.55] = SIDE_FLAT
+    return sides
+
+def _treelite_float32(booster: lgb.Booster):
+    """
+    Treelite model of a multiclass booster with float32 thresholds and leaf
+    values, built node by node from dump_model(). Only numerical splits with
+    LightGBM's 'None' or 'NaN' missing handling translate exactly; anything
+    else raises ValueError.
+    """
+    from treelite.model_builder import Metadata, ModelBuilder, PostProcessorFunc, TreeAnnotation
+
+    dump = booster.dump_model()
+    if not dump["objective"].startswith("multiclass "):
+        raise ValueError(f"unsupported objective {dump['objective']!r}")
+    n_class = dump["num_class"]
+    trees = dump["tree_info"]
+    builder = ModelBuilder(
+        threshold_type="float32",
+        leaf_output_type="float32",
+        metadata=Metadata(
+            num_feature=dump["max_feature_idx"] + 1,
+            task_type="kMultiClf",
+            average_tree_output=False,
+            num_target=1,
+            num_class=[n_class],
+            leaf_vector_shape=(1, 1),
+        ),
+        # LightGBM stores one tree per class and iteration, class-major within
+        # an iteration
+        tree_annotation=TreeAnnotation(
+            num_tree=len(trees),
+            target_id=[0] * len(trees),
+            class_id=[i % n_class for i in range(len(trees))],
+        ),
+        postprocessor=PostProcessorFunc(name="softmax"),
+        base_scores=[0.0] * n_class,
+    )
+    for tree in trees:
+        builder.start_tree()
+        nodes = [tree["tree_structure"]]  # node key = position in this list
+        for key, node in enumerate(nodes):
+            builder.start_node(key)
+            if "leaf_value" in node:
+                builder.leaf(node["leaf_value"])
+            else:
+                if node["decision_type"] != "<=" or node["missing_type"] not in ("None", "NaN"):
+                    raise ValueError(
+                        f"unsupported split {node['decision_type']!r}/{node['missing_type']!r}"
+                    )
+                # 'None' scores NaN as 0.0; 'NaN' sends it the learned way
+                if node["missing_type"] == "None":
+                    default_left = 0.0 <= node["threshold"]
+                else:
+                    default_left = node["default_left"]
+                builder.numerical_test(
+                    node["split_feature"], node["threshold"],
+                    default_left=default_left, opname="<=",
+                    left_child_key=len(nodes), right_child_key=len(nodes) + 1
+                )
+                nodes += [node["left_child"], node["right_child"]]
+            builder.end_node()
+        builder.end_tree()
+    return builder.commit()
+
+# single-row inference backends for decide(); everything but "lightgbm" is an
+# optional dependency and falls back to it when not installed
+BACKENDS = ("lightgbm", "treelite", "lleaves", "onnx")
+
+class _FastRowPredictor:
+    """
+    Single-row scoring through LGBM_BoosterPredictForMatSingleRowFast.
+
+    The fast config (parsed predict parameters and buffers) is created once;
+    each call hands the row pointer straight to the booster and reads the
+    class probabilities back from a persistent output buffer. Pointers to that
+    buffer and to `row`, the caller's input buffer, are converted once; the
+    call goes through the CFFI shim (models._lgbm_fast) when it is built, and
+    ctypes otherwise. Not thread-safe.
+    """
+
+    def __init__(self, booster: lgb.Booster, params: dict, row: np.ndarray = None):
+        self._booster = booster  # the config must not outlive the booster handle
+        self._ncol = booster.num_feature()
+        self._handle = ctypes.c_void_p()
+        _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFastInit(
+            booster._handle,
+            ctypes.c_int(_C_API_PREDICT_NORMAL),
+            ctypes.c_int(0),    # start_iteration
+            ctypes.c_int(-1),   # num_iteration: all trees
+            ctypes.c_int(_C_API_DTYPE_FLOAT64),
+            ctypes.c_int32(self._ncol),
+            _c_str(" ".join(f"{k}={v}" for k, v in params.items())),
+            ctypes.byref(self._handle)
+        ))
+        self._out = np.zeros(booster.num_model_per_iteration(), dtype=np.float64)
+        self._out_ptr = self._out.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        self._out_len = ctypes.c_int64()
+
+        if row is not None:
+            row = self._check_row(row)
+        self._row = row
+        if _fast_lib is not None:
+            self._c_handle = _ffi.cast("void *", self._handle.value)
+            self._c_out = _ffi.cast("double *", self._out.ctypes.data)
+            self._c_row = None if row is None else _ffi.cast("double *", row.ctypes.data)
+        else:
+            self._row_ptr = None if row is None else row.ctypes.data_as(ctypes.c_void_p)
+
+    def _check_row(self, row: np.ndarray) -> np.ndarray:
+        row = np.ascontiguousarray(row, dtype=np.float64)
+        # the C API reads ncol values from the pointer without checking
+        if row.size != self._ncol:
+            raise ValueError(f"expected {self._ncol} features, got {row.size}")
+        return row
+
+    def __call__(self, row: np.ndarray) -> np.ndarray:
+        own_row = row is self._row
+        if not own_row:
+            row = self._check_row(row)
+        if _fast_lib is not None:
+            c_row = self._c_row if own_row else _ffi.from_buffer("double[]", row)
+            _safe_call(_fast_lib.predict_row(self._c_handle, c_row, self._c_out))
+        else:
+            _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFast(
+                self._handle,
+                self._row_ptr if own_row else row.ctypes.data_as(ctypes.c_void_p),
+                ctypes.byref(self._out_len),
+                self._out_ptr
+            ))
+        return self._out.copy()
+
+    def __del__(self):
+        handle = getattr(self, "_handle", None)
+        if handle:
+            _LIB.LGBM_FastConfigFree(handle)
+            self._handle = None
 
 class PolicyModel:
     """
@@ -9,7 +230,17 @@ class PolicyModel:
     predicts whether to go long, short, or stay flat, and how much to allocate.
     """
 
-    def __init__(self, params: dict):
+    def __init__(
+        self,
+        params: dict,
+        backend: str = "lightgbm",
+        cache_dir: str = None,
+        pred_early_stop_margin: float = None,
+        device: str = None,
+        memo_size: int = 0,
+        memo_scale=1000.0,
+        float32_thresholds: bool = False
+    ):
         """
         Initialize the LightGBM classifier with provided hyperparameters.
         
@@ -21,8 +252,63 @@ class PolicyModel:
               'subsample': 0.8,
               'colsample_bytree': 0.8,
             }
+        backend: predictor used by decide() for single rows:
+            'lightgbm' - the LightGBM booster via its single-row fast C API
+            'treelite' - native library compiled from the booster with Treelite/TL2cgen
+            'lleaves'  - LLVM-compiled kernel built from the booster by lleaves
+            'onnx'     - ONNX export of the classifier run by onnxruntime (float32)
+        cache_dir: where compiled predictors are kept, keyed by a hash of the
+            trained model so a restart reuses them (default ~/.cache/cquant)
+        pred_early_stop_margin: if set, decide() on the LightGBM backend stops
+            walking trees once the top two raw class scores are this far apart
+            (checked every 10 iterations). Smaller margins are faster but move
+            the probabilities further from the full ensemble; around 2.0 and
+            up keeps the side decisions identical on typical models. Batch
+            scoring always runs the full ensemble.
+        device: training device, 'auto', 'gpu' or 'cpu' (default config.LGBM_DEVICE).
+            'auto' trains on the GPU when a probe succeeds; a 'device' entry in
+            params takes precedence. Inference always runs on the CPU.
+        memo_size: if > 0, decide() keeps the class probabilities of this many
+            recent feature rows (LRU) and reuses them for rows that round to
+            the same values, e.g. repeated ticks within one bar.
+        memo_scale: rows are matched after rint(row * memo_scale); a scalar or
+            one scale per model input (features, then state probabilities),
+            chosen to match the feature resolution.
+        float32_thresholds: with the 'treelite' backend, compile the trees with
+            float32 thresholds and inputs, halving the data touched per node.
+            Used only if its decisions agree with the float64 model on at
+            least 99.9% of the training rows; otherwise, and for models whose
+            splits cannot be narrowed, the float64 library is used.
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend: {backend!r}")
+        device = device or LGBM_DEVICE
+        if device not in ("auto", "gpu", "cpu"):
+            raise ValueError(f"Unknown training device: {device!r}")
         self.clf = lgb.LGBMClassifier(**params)
+        self.backend = backend
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "cquant"
+        self.pred_early_stop_margin = pred_early_stop_margin
+        self.device = device
+        self.memo_size = memo_size
+        self.memo_scale = np.asarray(memo_scale, dtype=np.float64)
+        self.float32_thresholds = float32_thresholds
+        self._memo = OrderedDict()  # quantized row bytes -> class probabilities
+        self._booster = None      # set by train()
+        self._predict_row = None  # (1, n_features) row -> 3 class probabilities
+        self._row = None          # decide()'s input buffer, in the predictor's dtype
+
+    def __getstate__(self):
+        # compiled predictors hold native handles; rebuild them after unpickling
+        state = self.__dict__.copy()
+        state["_predict_row"] = None
+        state["_row"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._booster is not None:
+            self._predict_row = self._build_predictor()
 
     def train(self, X: np.ndarray, y: np.ndarray):
         """
@@ -31,42 +317,340 @@ class PolicyModel:
         X: 2D array of shape (n_samples, n_features)
         y: 1D array of labels in {0: flat, 1: long, 2: short}
         """
+        self._select_device()
+        self._memo.clear()
         self.clf.fit(X, y)
+        # keep the raw booster: batch scoring goes straight to it, skipping
+        # the sklearn wrapper's validation and copies
+        self._booster = self._optimize_booster(self.clf.booster_)
+        self.clf._Booster = self._booster
+        self._predict_row = self._build_predictor(check_X=X)
+
+    def save(self, path):
+        """Write the trained booster to a LightGBM model file."""
+        self._booster.save_model(str(path))
+
+    @classmethod
+    def load(cls, path, params: dict = None, backend: str = "lightgbm",
+             cache_dir: str = None, **kwargs) -> "PolicyModel":
+        """
+        PolicyModel from a model file written by save().
+
+        Scoring (decide, decide_batch, predict_proba) works as after train();
+        compiled backends are looked up in cache_dir by the model's hash, so a
+        model loaded again reuses its compiled predictor instead of rebuilding.
+        The model file does not carry the classifier's hyperparameters: pass
+        the params it was trained with so a later train() uses them too
+        (without them it falls back to the LightGBM defaults).
+        """
+        model = cls(params or {}, backend=backend, cache_dir=cache_dir, **kwargs)
+        model._booster = lgb.Booster(model_file=str(path))
+        model._predict_row = model._build_predictor()
+        return model
+
+    def _select_device(self):
+        """Switch the classifier to GPU training if requested or available."""
+        params = self.clf.get_params()
+        if self.device == "cpu" or "device" in params or "device_type" in params:
+            return
+        if self.device == "auto" and not _lightgbm_gpu_available():
+            return
+        self.clf.set_params(**_GPU_PARAMS)
+        if "max_bin" not in params:
+            self.clf.set_params(max_bin=_GPU_MAX_BIN)
+        logger.info("training the policy model on GPU")
+
+    @staticmethod
+    def _optimize_booster(booster: lgb.Booster) -> lgb.Booster:
+        """
+        Re-index categorical splits so cat_threshold only holds values some
+        tree actually uses; predictions are unchanged. A no-op for purely
+        numeric models (no categorical split, nothing to drop) or when
+        LightGBMModelOptimizer is not installed.
+        """
+        if _ModelOptimizer is None:
+            return booster
+        model_str = booster.model_to_string()
+        if "cat_threshold=" not in model_str:
+            return booster
+        # pool_size=1 takes the library's serial path, which re-parses trees
+        # it already parsed and fails; worker processes get fresh copies
+        optimized = _ModelOptimizer(pool_size=2).optimize_model_string(model_str)
+        return lgb.Booster(model_str=optimized)
+
+    def _model_key(self) -> str:
+        """Content hash of the trained booster, names its compiled artifacts."""
+        return hashlib.sha1(self._booster.model_to_string().encode()).hexdigest()[:16]
+
+    def _cached_file(self, suffix: str, write) -> Path:
+        """
+        Path of this model's artifact in cache_dir, produced by write(tmp_path)
+        and moved into place atomically if it does not exist yet.
+        """
+        path = self.cache_dir / f"policy-{self._model_key()}{suffix}"
+        if not path.exists():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+            write(tmp)
+            os.replace(tmp, path)
+        return path
+
+    def _predict_params(self) -> dict:
+        """LightGBM prediction parameters for single-row scoring."""
+        params = {"num_threads": 1}  # one row: threads only add sync cost
+        if self.pred_early_stop_margin is not None:
+            params.update(
+                pred_early_stop=True,
+                pred_early_stop_freq=_PRED_EARLY_STOP_FREQ,
+                pred_early_stop_margin=self.pred_early_stop_margin,
+            )
+        return params
+
+    def _build_predictor(self, check_X: np.ndarray = None):
+        """
+        Single-row predictor for the configured backend. check_X, when given,
+        is data to validate reduced-precision predictors against.
+        """
+        builders = {
+            "treelite": lambda: self._build_treelite(check_X),
+            "lleaves": self._build_lleaves,
+            "onnx": self._build_onnx,
+        }
+        n_features = self._booster.num_feature()
+        if self.backend in builders:
+            # preallocated input row in the backend's native dtype
+            dtype = np.float32 if self.backend == "onnx" else np.float64
+            self._row = np.zeros((1, n_features), dtype=dtype)
+            try:
+                return builders[self.backend]()
+            except ImportError:
+                logger.warning("%s not installed; decide() falls back to LightGBM", self.backend)
+            except Exception:
+                # e.g. no C toolchain or an incompatible llvmlite
+                logger.exception("building the %s predictor failed; decide() falls back to LightGBM", self.backend)
+        self._row = np.zeros((1, n_features), dtype=np.float64)
+        params = self._predict_params()
+        try:
+            return _FastRowPredictor(self._booster, params, row=self._row)
+        except (AttributeError, lgb.basic.LightGBMError):
+            # C API entry point missing in this LightGBM build
+            logger.warning("LightGBM fast single-row API unavailable; using Booster.predict")
+        booster = self._booster
+        return lambda row: booster.predict(row, **params)[0]
+
+    def _build_treelite(self, check_X: np.ndarray = None):
+        import treelite
+        import tl2cgen
+
+        def export(model):
+            # compiling is slow (seconds to minutes); do it once per model
+            return lambda tmp: tl2cgen.export_lib(
+                model,
+                toolchain="gcc",
+                libpath=str(tmp),
+                params={"parallel_comp": os.cpu_count()}
+            )
+
+        libpath = None
+        if self.float32_thresholds:
+            libpath = self._treelite_float32_lib(export, check_X)
+        if libpath is None:
+            libpath = self._cached_file(".so", export(treelite.frontend.from_lightgbm(self._booster)))
+        # one thread: a single row has nothing to parallelize
+        predictor = tl2cgen.Predictor(str(libpath), nthread=1)
+        dtype = predictor.threshold_type
+        self._row = np.zeros((1, self._booster.num_feature()), dtype=dtype)
+        # DMatrix refuses to convert dtypes itself; decide()'s row buffer is
+        # already in the right one
+        return lambda row: predictor.predict(tl2cgen.DMatrix(np.asarray(row, dtype=dtype)))[0, 0]
+
+    def _treelite_float32_lib(self, export, check_X: np.ndarray = None):
+        """
+        Path of the float32-threshold Treelite library, or None to use the
+        float64 one. A cached library has passed the agreement check already;
+        without check_X a new one cannot be validated and is not built.
+        """
+        import tl2cgen
+
+        path = self.cache_dir / f"policy-{self._model_key()}-f32.so"
+        if path.exists():
+            return path
+        if check_X is None:
+            return None
+        try:
+            model = _treelite_float32(self._booster)
+        except ValueError as e:
+            logger.info("float32 thresholds not applicable (%s); using float64", e)
+            return None
+
+        # validate before moving into the cache, so only checked libraries land there
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+        try:
+            export(model)(tmp)
+            predictor = tl2cgen.Predictor(str(tmp), nthread=os.cpu_count())
+            X32 = np.asarray(check_X, dtype=np.float32)
+            proba32 = predictor.predict(tl2cgen.DMatrix(X32))[:, 0]
+            agreement = np.mean(_decision_sides(proba32) == _decision_sides(self.predict_proba(check_X)))
+            if agreement >= _FLOAT32_MIN_AGREEMENT:
+                os.replace(tmp, path)
+                return path
+            logger.info("float32 thresholds agree on %.2f%% of decisions; using float64", 100 * agreement)
+            return None
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _build_lleaves(self):
+        import lleaves
+
+        model_txt = self._cached_file(".txt", lambda tmp: self._booster.save_model(str(tmp)))
+        model = lleaves.Model(model_file=str(model_txt))
+        # the compiled ELF is cached next to the model text; later runs only load it
+        model.compile(cache=str(model_txt.with_suffix(".elf")))
+        # predict() already applies the softmax; n_jobs=1 for single rows
+        return lambda row: model.predict(row, n_jobs=1)[0]
+
+    def _build_onnx(self):
+        import onnxruntime as ort
+
+        n_features = self._booster.num_feature()
+
+        def export(tmp):
+            # the converter is only needed when the model is not cached yet
+            import onnxmltools
+            from onnxmltools.convert.common.data_types import FloatTensorType
+            onx = onnxmltools.convert_lightgbm(
+                self._booster,
+                initial_types=[("X", FloatTensorType([None, n_features]))],
+                zipmap=False
+            )
+            tmp.write_bytes(onx.SerializeToString())
+
+        onnx_path = self._cached_file(".onnx", export)
+        so = ort.SessionOptions()
+        so.intra_op_num_threads = 1
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sess = ort.InferenceSession(str(onnx_path), sess_options=so, providers=["CPUExecutionProvider"])
+
+        # bind decide()'s row buffer and a fixed output buffer once; a call on
+        # the row buffer itself needs no copy at all
+        x_buf = self._row
+        p_buf = np.empty((1, 3), dtype=np.float32)
+        io = sess.io_binding()
+        io.bind_input("X", "cpu", 0, np.float32, x_buf.shape, x_buf.ctypes.data)
+        io.bind_output("probabilities", "cpu", 0, np.float32, p_buf.shape, p_buf.ctypes.data)
+
+        def predict_row(row):
+            if row is not x_buf:
+                x_buf[:] = row
+            sess.run_with_iobinding(io)
+            return p_buf[0].astype(np.float64)
+        return predict_row
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a whole matrix in a single model call.
+
+        X: 2D array of shape (n_samples, n_features)
+        Returns an array of shape (n_samples, 3): [flat_prob, long_prob, short_prob].
+        """
+        # LightGBM copies anything that is not C-contiguous float64
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        return self._booster.predict(X, num_threads=os.cpu_count())
+
+    def decide_batch(
+        self,
+        feat_mat: np.ndarray,
+        prob_mat: np.ndarray,
+        risk_aversion: float = 0.02
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized counterpart of decide() for many time steps at once.
+
+        feat_mat: 2D array of shape (n_samples, n_features) with the feature vectors.
+        prob_mat: 2D array of shape (n_samples, n_states) with HMM state probabilities.
+        risk_aversion: maximum fraction of equity to risk on each trade.
+
+        Returns:
+            sides: int8 array of shape (n_samples,) in the label coding
+                   {0: flat, 1: long, 2: short}
+            sizes: float array of shape (n_samples,), fraction of equity to allocate
+        """
+        proba = self.predict_proba(np.concatenate([feat_mat, prob_mat], axis=1))
+
+        # same rules as decide()
+        sides = _decision_sides(proba)
+        edge = np.minimum(np.abs(proba[:, 1] - proba[:, 2]), risk_aversion)
+        sizes = np.where(sides != SIDE_FLAT, edge, 0.0)
+        return sides, sizes
+
+    def _fill_row(self, feat_vec: np.ndarray, prob_state: np.ndarray = None) -> np.ndarray:
+        """
+        Write features and state probabilities side by side into the row
+        buffer, the layout the model is trained on. Any dtype or stride; no
+        temporary, and the predictor gets exactly the contiguous array it wants.
+        """
+        row = self._row
+        if prob_state is None:
+            row[:] = feat_vec
+        else:
+            n_feat = row.shape[1] - np.size(prob_state)
+            row[0, :n_feat] = feat_vec
+            row[0, n_feat:] = prob_state
+        return row
+
+    def _row_proba(self, row: np.ndarray) -> list:
+        """
+        Class probabilities of one row as plain floats (numpy scalar
+        arithmetic is several times slower), memoized if memo_size > 0.
+        """
+        if not self.memo_size:
+            return self._predict_row(row).tolist()
+
+        with np.errstate(invalid="ignore"):
+            q = np.rint(row * self.memo_scale)
+        if not np.isfinite(q).all():
+            # NaN/inf have no meaningful rounded value; always score these rows
+            return self._predict_row(row).tolist()
+        key = q.astype(np.int64).tobytes()
+        proba = self._memo.get(key)
+        if proba is not None:
+            self._memo.move_to_end(key)
+            return proba
+        proba = self._predict_row(row).tolist()
+        self._memo[key] = proba
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+        return proba
 
     def decide(
         self,
-        feat_row: np.ndarray,
+        feat_vec: np.ndarray,
         prob_state: np.ndarray,
         risk_aversion: float = 0.02
-    ) -> dict:
+    ) -> Decision:
         """
         Make a trading decision for one time step.
 
-        feat_row: 2D array of shape (1, n_features) containing the feature vector.
-        prob_state: 1D array of shape (n_states,) with HMM state probabilities.
+        feat_vec: array of shape (n_features,) or (1, n_features) with the
+            technical+sentiment features, in training column order.
+        prob_state: 1D array of shape (n_states,) with HMM state probabilities;
+            appended to feat_vec inside the model, as in decide_batch(). Pass
+            None if feat_vec already holds the full row.
         risk_aversion: maximum fraction of equity to risk on this trade.
 
         Returns:
-            {
-                "side": "long" | "short" | "flat",
-                "size": float  # fraction of equity to allocate
-            }
+            Decision(side, size): side code SIDE_FLAT / SIDE_LONG / SIDE_SHORT
+            (0 / 1 / 2) and the fraction of equity to allocate; SIDE_NAMES[side]
+            gives the name. Flat decisions are the FLAT singleton.
         """
-        # Combine technical+sentiment features (in feat_row) with regime probs if desired
-        # Here we assume feat_row already includes state probabilities appended.
-
-        proba = self.clf.predict_proba(feat_row)[0]
         # proba indices: [flat_prob, long_prob, short_prob]
-        flat_p, long_p, short_p = proba
+        _, long_p, short_p = self._row_proba(self._fill_row(feat_vec, prob_state))
 
         # If no strong edge, stay flat
-        if max(long_p, short_p) < 0.55:
-            return {"side": "flat", "size": 0.0}
-
-        # Decide side by higher probability
-        side = "long" if long_p > short_p else "short"
-        edge = abs(long_p - short_p)
+        if long_p < 0.55 and short_p < 0.55:
+            return FLAT
 
-        # Position size as fraction of equity, capped by risk_aversion
-        size = min(edge, risk_aversion)
-        return {"side": side, "size": size}
+        # Decide side by higher probability; size is the edge capped by risk_aversion
+        side = SIDE_LONG if long_p > short_p else SIDE_SHORT
+        return Decision(side, min(abs(long_p - short_p), risk_aversion))
@@ -0,0 +1,27 @@
+# tests/test_binance_client.py
+
+import importlib
+import threading
+import time
+
+from binance.client import Client
+
+def test_fetch_klines_many_uses_one_client_per_thread(monkeypatch):
+    # the module pings Binance when its client is created
+    monkeypatch.setattr(Client, "ping", lambda self: {})
+    bc = importlib.import_module("cqio.binance_client")
+
+    calls = []
+    def get_historical_klines(self, symbol, interval, start_str, end_str=None):
+        calls.append((threading.get_ident(), self))
+        time.sleep(0.01)  # keep the workers overlapping
+        return [[0, "1", "1", "1", "1", "1"]]
+    monkeypatch.setattr(Client, "get_historical_klines", get_historical_klines)
+
+    out = bc.fetch_klines_many([f"S{i}USDT" for i in range(8)], "1h", max_workers=4)
+    assert len(out) == 8
+    clients = {}
+    for ident, api in calls:
+        assert api is not bc.client
+        assert clients.setdefault(ident, api) is api  # one client per thread
+    assert len({id(api) for api in clients.values()}) == len(clients)
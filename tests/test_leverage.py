@@ -0,0 +1,24 @@
+# tests/test_leverage.py
+
+import numpy as np
+import pytest
+
+from core.leverage import choose_leverage, choose_leverage_batch
+
+def test_batch_matches_scalar():
+    balances = np.array([50.0, 500.0, 5000.0])
+    lev, qty = choose_leverage_batch(balances, 0.01, np.array([2.0, 20.0, 200.0]))
+    for i, b in enumerate(balances):
+        assert (lev[i], qty[i]) == choose_leverage(b, 0.01, [2.0, 20.0, 200.0][i])
+
+@pytest.mark.parametrize("balance, risk_frac, stop_usd", [
+    (500.0, np.nan, 20.0),
+    (500.0, 0.01, np.nan),
+    (-1.0, 0.01, 20.0),
+    (np.nan, 0.01, 20.0),
+])
+def test_invalid_inputs_raise(balance, risk_frac, stop_usd):
+    with pytest.raises(ValueError):
+        choose_leverage(balance, risk_frac, stop_usd)
+    with pytest.raises(ValueError):
+        choose_leverage_batch([100.0, balance], [0.01, risk_frac], [20.0, stop_usd])
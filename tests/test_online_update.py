@@ -0,0 +1,66 @@
+# tests/test_online_update.py
+
+import numpy as np
+import pandas as pd
+
+from models.online_update import OnlineUpdater
+
+class _RecordingModel:
+    """Stands in for PolicyModel; keeps the arrays retrain() passes."""
+
+    def train(self, X, y):
+        self.X, self.y = X, y
+
+def _batch(n, width, start=0):
+    X = np.arange(start, start + n * width, dtype=np.float64).reshape(n, width)
+    features = pd.DataFrame(X, columns=[f"f{i}" for i in range(width)])
+    return features, pd.Series(np.arange(n) % 3)
+
+def test_width_change_seeds_empty_ring(tmp_path, monkeypatch):
+    model = _RecordingModel()
+    upd = OnlineUpdater(model, training_path=str(tmp_path / "train.parquet"),
+                        window_size=10, compact_slack=100)
+    upd.add_observations(*_batch(4, 3))
+
+    loads = []
+    load_history = upd._load_history
+    monkeypatch.setattr(upd, "_load_history", lambda: loads.append(1) or load_history())
+
+    # the stored rows are 3 wide and cannot be mixed with 5-wide ones
+    new_X, new_y = _batch(3, 5, start=100)
+    upd.add_observations(new_X, new_y)
+    assert upd._ring_X.shape == (10, 5)
+    assert upd._count == 3
+
+    # later batches of the new width do not read the history again
+    more_X, more_y = _batch(2, 5, start=200)
+    upd.add_observations(more_X, more_y)
+    assert len(loads) == 1
+
+    upd.retrain()
+    np.testing.assert_array_equal(model.X, np.vstack([new_X.to_numpy(), more_X.to_numpy()]))
+    np.testing.assert_array_equal(model.y, np.concatenate([new_y, more_y]))
+
+def test_width_change_compaction_and_restart(tmp_path):
+    path = tmp_path / "train.parquet"
+    upd = OnlineUpdater(_RecordingModel(), training_path=str(path),
+                        window_size=10, compact_slack=2)
+    upd.add_observations(*_batch(4, 3))
+
+    # 3 + 3 + 4 + 3 rows of width 5 run past window + slack and compact
+    batches = [_batch(n, 5, start=100 * i) for i, n in enumerate((3, 3, 4, 3), 1)]
+    for X, y in batches:
+        upd.add_observations(X, y)
+    stored = pd.read_parquet(path)
+    assert list(stored.columns) == [f"f{i}" for i in range(5)] + ["label"]
+    assert len(stored) == 10 and not stored.isna().any().any()
+    # the old-width history is moved aside, not deleted
+    assert len(list(tmp_path.glob("train.parquet.*.old"))) == 1
+
+    # a restarted updater retrains from disk with only the new-width rows
+    model = _RecordingModel()
+    OnlineUpdater(model, training_path=str(path), window_size=10).retrain()
+    X_all = np.vstack([X.to_numpy() for X, _ in batches])
+    y_all = np.concatenate([y.to_numpy() for _, y in batches])
+    np.testing.assert_array_equal(model.X, X_all[-10:])
+    np.testing.assert_array_equal(model.y, y_all[-10:])
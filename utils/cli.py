@@ -1,25 +1,50 @@
 # utils/cli.py
 
-import click
-from live.trader import main_loop
-from backtest.backtester import run_backtest
+import argparse
+from pathlib import Path
 
-@click.group()
-def cli():
-    """Command-line interface for the crypto HMM-ML bot."""
-    pass
+# Subsystems are imported inside the command functions: `bt` never loads the
+# live trading stack, and --help loads neither.
+
+# trained models reused across `bt` runs on the same data
+MODEL_CACHE = Path.home() / ".cache" / "cquant"
 
-@cli.command()
-@click.option("--paper/--live", default=True, help="Run in paper mode (no real orders) or live mode.")
-def trade(paper):
+def trade(paper: bool):
     """Start the trading bot (paper-trade or live)."""
+    from live.trader import main_loop
     main_loop(paper)
 
-@cli.command()
-@click.option("--pair", default="BTCUSDT", help="Ticker symbol to backtest (e.g. BTCUSDT).")
-def bt(pair):
+def bt(pair: str, retrain: bool = False):
     """Run a backtest for the specified trading pair."""
-    run_backtest(pair)
+    from backtest.backtester import run_backtest
+    run_backtest(pair, model_cache=None if retrain else str(MODEL_CACHE))
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m utils.cli",
+        description="Command-line interface for the crypto HMM-ML bot."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p_trade = commands.add_parser("trade", help=trade.__doc__, description=trade.__doc__)
+    p_trade.add_argument("--paper", dest="paper", action="store_true", default=True,
+                         help="Run in paper mode, no real orders (default).")
+    p_trade.add_argument("--live", dest="paper", action="store_false",
+                         help="Run in live mode.")
+    p_trade.set_defaults(func=lambda args: trade(args.paper))
+
+    p_bt = commands.add_parser("bt", help=bt.__doc__, description=bt.__doc__)
+    p_bt.add_argument("--pair", default="BTCUSDT",
+                      help="Ticker symbol to backtest (e.g. BTCUSDT).")
+    p_bt.add_argument("--retrain", action="store_true",
+                      help=f"Train a fresh model instead of reusing one from {MODEL_CACHE}.")
+    p_bt.set_defaults(func=lambda args: bt(args.pair, args.retrain))
+    return parser
+
+def cli(argv=None):
+    """Command-line interface for the crypto HMM-ML bot."""
+    args = build_parser().parse_args(argv)
+    args.func(args)
 
 if __name__ == "__main__":
     cli()
@@ -1,19 +1,26 @@
 # utils/logger.py
 
+import atexit
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 # Configuration from environment or defaults
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 LOG_PATH = os.getenv("LOG_PATH", "logs/app.log")
 MAX_BYTES = 10 * 1024 * 1024  # 10 MB per log file
 BACKUP_COUNT = 5              # keep last 5 log files
+FLUSH_BYTES = 64 * 1024       # write the file buffer out once it holds 64 KB
+FLUSH_INTERVAL = 0.5          # ... or once it is this many seconds old
 
-# Ensure log directory exists
-log_dir = os.path.dirname(LOG_PATH)
-if log_dir and not os.path.exists(log_dir):
-    os.makedirs(log_dir, exist_ok=True)
+# Skip the per-record introspection Logger.makeRecord would otherwise do;
+# the format below uses none of these fields (funcName/lineno need _srcfile)
+logging.logMultiprocessing = False
+logging.logThreads = False
+logging.logProcesses = False
+logging._srcfile = None
 
 # Formatter
 _formatter = logging.Formatter(
@@ -21,31 +28,172 @@ _formatter = logging.Formatter(
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 
-# Console handler
-_console_handler = logging.StreamHandler()
-_console_handler.setLevel(LOG_LEVEL)
-_console_handler.setFormatter(_formatter)
-
-# Rotating file handler
-_file_handler = RotatingFileHandler(
-    LOG_PATH,
-    maxBytes=MAX_BYTES,
-    backupCount=BACKUP_COUNT,
-    encoding="utf-8"
-)
-_file_handler.setLevel(LOG_LEVEL)
-_file_handler.setFormatter(_formatter)
+class _BufferedRotatingFileHandler(logging.Handler):
+    """
+    Size-rotated log file written with os.write on a raw descriptor.
+
+    Formatted records collect in a buffer that goes out in one write once it
+    holds flush_bytes or flush_interval seconds have passed, and on flush().
+    The file size is tracked from the bytes written (one fstat when the file
+    is opened) instead of a stat per record. Rotation follows
+    RotatingFileHandler: app.log -> app.log.1 -> ... -> app.log.<backup_count>,
+    and never happens with backup_count=0. The file is opened on first write.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int,
+        backup_count: int,
+        encoding: str = "utf-8",
+        flush_bytes: int = FLUSH_BYTES,
+        flush_interval: float = FLUSH_INTERVAL
+    ):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.encoding = encoding
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._fd = None
+        self._size = 0
+        self._buf = bytearray()
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            self._buf += (self.format(record) + "\n").encode(self.encoding)
+            if (len(self._buf) >= self.flush_bytes
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._write_buffer()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        with self.lock:
+            self._write_buffer()
+
+    def close(self):
+        with self.lock:
+            try:
+                self._write_buffer()
+            finally:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                super().close()
+
+    def _write_buffer(self):
+        self._last_flush = time.monotonic()
+        if not self._buf:
+            return
+        if self._fd is None:
+            self._open()
+        if (self.backup_count > 0 and self._size > 0
+                and self._size + len(self._buf) > self.max_bytes):
+            self._rotate()
+        with memoryview(self._buf) as view:
+            written = 0
+            while written < len(view):  # os.write may write less than asked
+                written += os.write(self._fd, view[written:])
+        self._size += len(self._buf)
+        self._buf.clear()
+
+    def _open(self):
+        self._fd = os.open(self.baseFilename, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._size = os.fstat(self._fd).st_size
+
+    def _rotate(self):
+        os.close(self._fd)
+        self._fd = None
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.baseFilename}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.baseFilename}.{i + 1}")
+        os.replace(self.baseFilename, f"{self.baseFilename}.1")
+        self._open()
+
 
-# Root logger configuration
-_root_logger = logging.getLogger()
-_root_logger.setLevel(LOG_LEVEL)
-_root_logger.addHandler(_console_handler)
-_root_logger.addHandler(_file_handler)
+class _FlushingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue runs dry."""
 
+    def handle(self, record):
+        super().handle(record)
+        # a burst of records shares one write; a lone record is not left
+        # sitting in the file buffer until the next one arrives
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+# name of the root QueueHandler; marks logging as configured even across a
+# reload of this module
+_HANDLER_NAME = "cquant"
+_configured = False
+_listener = None
+
+
+def _configure_once():
+    """
+    Attach the console and rotating file handlers on first use rather than at
+    import, so importing (e.g. for CLI --help) creates no directories or
+    files, and a second import or reload never adds a second set of handlers.
+    """
+    global _configured, _listener
+    if _configured:
+        return
+    _root_logger = logging.getLogger()
+    if any(h.get_name() == _HANDLER_NAME for h in _root_logger.handlers):
+        _configured = True
+        return
+
+    # Ensure log directory exists
+    log_dir = os.path.dirname(LOG_PATH)
+    if log_dir and not os.path.exists(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
+
+    # Console handler
+    _console_handler = logging.StreamHandler()
+    _console_handler.setLevel(LOG_LEVEL)
+    _console_handler.setFormatter(_formatter)
+
+    # Rotating file handler; the file is opened by the first write
+    _file_handler = _BufferedRotatingFileHandler(
+        LOG_PATH,
+        max_bytes=MAX_BYTES,
+        backup_count=BACKUP_COUNT,
+        encoding="utf-8"
+    )
+    _file_handler.setLevel(LOG_LEVEL)
+    _file_handler.setFormatter(_formatter)
+
+    # Root logger configuration: callers only enqueue records, a background
+    # thread does the console/file I/O
+    _log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(_log_queue)
+    _queue_handler.set_name(_HANDLER_NAME)
+    _root_logger.setLevel(LOG_LEVEL)
+    _root_logger.addHandler(_queue_handler)
+
+    _listener = _FlushingQueueListener(
+        _log_queue, _console_handler, _file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    # drain whatever is still queued before the interpreter exits, then write
+    # out the file buffer (atexit runs these last-registered first)
+    atexit.register(_file_handler.close)
+    atexit.register(_listener.stop)
+    _configured = True
 
 def get_logger(name: str = None) -> logging.Logger:
     """
     Retrieve a logger instance with the given name.
     If name is None, returns the root logger.
+
+    Pass values as %-style arguments rather than f-strings,
+        logger.debug("fill %s @ %.2f", sym, price)
+    so a record dropped by the level check is never formatted.
     """
+    _configure_once()
     return logging.getLogger(name)